@@ -0,0 +1,425 @@
+"""
+Load benchmarks for generic_rdf_loader
+
+Generates WordNet-shaped synthetic RDF at a given size, loads it with
+`load_any_rdf_to_falkordb` (into a local FalkorDB or an in-process fake graph
+that only measures the client side), and records per-phase throughput and
+peak RSS in a JSON results file. Two results files can be compared to catch
+regressions.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import sys
+import time
+
+from generic_rdf_loader import DEFAULT_BATCH_SIZE, DEFAULT_MAX_IN_FLIGHT, load_any_rdf_to_falkordb
+from run_metrics import peak_rss_mb
+
+BENCH_PREFIXES = {
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'ontolex': 'http://www.w3.org/ns/lemon/ontolex#',
+    'skos': 'http://www.w3.org/2004/02/skos/core#',
+    'wn': 'https://globalwordnet.github.io/schemas/wn#',
+    'oewn': 'https://en-word.net/id/'
+}
+
+# Relative frequency of synset relations, roughly as in Open English WordNet
+DEFAULT_RELATION_WEIGHTS = {
+    'hypernym': 30, 'hyponym': 30, 'similar': 8, 'mero_part': 4, 'holo_part': 4,
+    'also': 3, 'antonym': 2, 'domain_topic': 3, 'has_domain_topic': 3, 'attribute': 1
+}
+RELATION_NAME_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+DEFAULT_RELATIONS_PER_SYNSET = 2
+DEFAULT_ENTRIES_PER_SYNSET = 2
+POS_TAGS = ('n', 'v', 'a', 'r')
+
+# Throughput metrics compared between runs (higher is better)
+THROUGHPUT_KEYS = (
+    'parse_triples_per_sec', 'process_triples_per_sec', 'nodes_per_sec',
+    'relationships_per_sec', 'stream_triples_per_sec', 'pipeline_triples_per_sec'
+)
+DEFAULT_TOLERANCE = 0.10
+
+def parse_relation_weights(text):
+    """
+    Parse 'hypernym=0.5,hyponym=0.3,...' into a relation -> weight dict
+    
+    Raises:
+        ValueError: on a malformed entry, a name that is not a plain
+                    identifier (names become `wn:` IRIs) or a weight <= 0
+    """
+    weights = {}
+    for item in text.split(','):
+        name, sep, value = item.strip().partition('=')
+        if not sep or not RELATION_NAME_PATTERN.match(name):
+            raise ValueError(f"expected relation=weight, got {item.strip()!r}")
+        weights[name] = float(value)
+        if weights[name] <= 0:
+            raise ValueError(f"weight of {name} must be positive")
+    return weights
+
+def synthetic_file_name(size, seed, fmt, relation_weights=None):
+    """Generated file for a case; custom weights get their own file, since files are reused"""
+    if not relation_weights:
+        return f"synthetic-{size}-s{seed}.{fmt}"
+    digest = hashlib.sha1(json.dumps(relation_weights, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+    return f"synthetic-{size}-s{seed}-w{digest}.{fmt}"
+
+def iter_synthetic_triples(triples, seed=0, relation_weights=None,
+                           relations_per_synset=DEFAULT_RELATIONS_PER_SYNSET,
+                           entries_per_synset=DEFAULT_ENTRIES_PER_SYNSET):
+    """
+    Yield WordNet-shaped triples until `triples` have been produced
+    
+    Each synset gets a type, part of speech and definition, about
+    `entries_per_synset` lexical entries (each with a form, a written
+    form and a sense pointing back at the synset), and about
+    `relations_per_synset` synset relations whose types are drawn from
+    `relation_weights` and whose targets are other synsets of the file.
+    
+    Yields:
+        (subject, predicate, object, is_literal) with prefixed names
+        ('wn:hypernym') for IRIs
+    """
+    rng = random.Random(seed)
+    weights = relation_weights or DEFAULT_RELATION_WEIGHTS
+    relations = list(weights)
+    relation_cum = []
+    total = 0
+    for name in relations:
+        total += weights[name]
+        relation_cum.append(total)
+    synsets = max(1, triples // (3 + entries_per_synset * 5 + relations_per_synset))
+    entries = set()
+    produced = 0
+    
+    for i in range(synsets * 2):
+        pos = POS_TAGS[i % len(POS_TAGS)]
+        synset = f"oewn:{i:08d}-{pos}"
+        words = {f"word{rng.randrange(synsets * 3)}" for _ in range(rng.randint(1, entries_per_synset * 2 - 1))}
+        words = sorted(words)
+        block = [
+            (synset, 'rdf:type', 'ontolex:LexicalConcept', False),
+            (synset, 'wn:partOfSpeech', f"wn:{pos}", False),
+            (synset, 'skos:definition', ' '.join(rng.choice(words) for _ in range(8)), True)
+        ]
+        for word in words:
+            entry = f"oewn:{word}-{pos}"
+            sense = f"{entry}-{i:08d}"
+            if entry not in entries:
+                # An entry is defined once and then only gains senses
+                entries.add(entry)
+                block += [
+                    (entry, 'rdf:type', 'ontolex:LexicalEntry', False),
+                    (entry, 'ontolex:canonicalForm', f"{entry}-form", False),
+                    (f"{entry}-form", 'ontolex:writtenForm', word, True)
+                ]
+            block += [
+                (entry, 'ontolex:sense', sense, False),
+                (sense, 'ontolex:isLexicalizedSenseOf', synset, False)
+            ]
+        for _ in range(relations_per_synset):
+            pick = rng.random() * total
+            rel = relations[next(k for k, cum in enumerate(relation_cum) if pick < cum)]
+            target = rng.randrange(synsets)
+            block.append((synset, f"wn:{rel}", f"oewn:{target:08d}-{POS_TAGS[target % len(POS_TAGS)]}", False))
+        for triple in block:
+            if produced >= triples:
+                return
+            produced += 1
+            yield triple
+
+def _expand(name):
+    prefix, local = name.split(':', 1)
+    return f"<{BENCH_PREFIXES[prefix]}{local}>"
+
+def generate_synthetic_rdf(path, triples, seed=0, relation_weights=None,
+                           relations_per_synset=DEFAULT_RELATIONS_PER_SYNSET,
+                           entries_per_synset=DEFAULT_ENTRIES_PER_SYNSET):
+    """
+    Write a synthetic WordNet-shaped file (.nt as N-Triples, .ttl as Turtle with prefixes)
+    
+    Returns:
+        dict with path, format, triples and size in bytes
+    """
+    turtle = path.endswith('.ttl')
+    with open(path, 'w', encoding='utf-8') as f:
+        if turtle:
+            for prefix, iri in BENCH_PREFIXES.items():
+                f.write(f"@prefix {prefix}: <{iri}> .\n")
+        count = 0
+        for subj, pred, obj, is_literal in iter_synthetic_triples(
+                triples, seed, relation_weights, relations_per_synset, entries_per_synset):
+            if turtle:
+                obj_text = f'"{obj}"@en' if is_literal else obj
+                f.write(f"{subj} {'a' if pred == 'rdf:type' else pred} {obj_text} .\n")
+            else:
+                obj_text = f'"{obj}"@en' if is_literal else _expand(obj)
+                f.write(f"{_expand(subj)} {_expand(pred)} {obj_text} .\n")
+            count += 1
+    return {'path': path, 'format': 'ttl' if turtle else 'nt', 'triples': count, 'bytes': os.path.getsize(path)}
+
+class NullResult:
+    """QueryResult stand-in whose counters assume every row was written"""
+    
+    def __init__(self, **counters):
+        self.nodes_created = counters.get('nodes_created', 0)
+        self.relationships_created = counters.get('relationships_created', 0)
+        self.labels_added = counters.get('labels_added', 0)
+        self.result_set = []
+
+class NullGraph:
+    """
+    In-process graph that accepts the loader's queries without storing anything
+    
+    Used for client-only measurements: parse, processing and batching costs
+    without a server in the loop.
+    """
+    
+    def __init__(self):
+        self.queries = 0
+    
+    def query(self, q, params=None, timeout=None):
+        self.queries += 1
+        rows = len((params or {}).get('rows', ()))
+        if 'CREATE (:Resource' in q or 'CREATE (n:Resource' in q:
+            return NullResult(nodes_created=rows)
+        if 'CREATE (s)-[' in q:
+            return NullResult(relationships_created=rows)
+        if 'SET n:' in q:
+            return NullResult(labels_added=rows)
+        return NullResult()
+    
+    def ro_query(self, q, params=None, timeout=None):
+        return self.query(q, params, timeout)
+
+class NullFalkorDB:
+    """`client=` replacement for FalkorDB that hands out NullGraphs"""
+    
+    def select_graph(self, graph_name):
+        return NullGraph()
+
+def run_case(case):
+    """
+    Run one benchmark case and return its measurements
+    
+    Meant to run in a fresh process (see `run_benchmarks`) so that peak RSS
+    belongs to this case alone.
+    """
+    client = NullFalkorDB() if case['fake'] else None
+    output = io.StringIO()
+    start = time.time()
+    with redirect_stdout(output):
+        result = load_any_rdf_to_falkordb(
+            case['path'], graph_name=case['graph'], host=case['host'], port=case['port'],
+            batch_size=case['batch_size'], max_in_flight=case['max_in_flight'],
+            stream=case['mode'] == 'stream', pipeline=case['mode'] == 'pipeline',
+            workers=case['workers'], client=client
+        )
+    elapsed = time.time() - start
+    if 'error' in result:
+        return dict(case, error=result['error'])
+    return dict(
+        case,
+        elapsed_seconds=elapsed,
+        triples_loaded=result['triples_loaded'],
+        nodes_created=result['nodes_created'],
+        relationships_created=result['relationships_created'],
+        phase_seconds=result['phase_seconds'],
+        phase_throughput=result['phase_throughput'],
+        peak_rss_mb=peak_rss_mb(),
+        peak_children_rss_mb=peak_rss_mb(children=True)
+    )
+
+def run_benchmarks(sizes, formats=('nt',), modes=('table',), data_dir='data/benchmark',
+                   output_path=None, fake=True, host='localhost', port=6379,
+                   batch_size=DEFAULT_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                   workers=None, seed=0, relation_weights=None):
+    """
+    Generate inputs and run every size x format x mode combination
+    
+    Args:
+        sizes: triple counts to generate
+        formats: 'nt' and/or 'ttl'
+        modes: 'table' (default load), 'stream' and/or 'pipeline' (server only)
+        data_dir: where generated files are kept (reused if already there)
+        output_path: JSON results file to write
+        fake: measure the client only, against an in-process NullGraph
+        host, port: FalkorDB server when `fake` is False
+        batch_size, max_in_flight, workers: passed to the loader
+        seed, relation_weights: synthetic data shape
+    
+    Returns:
+        results dict (environment info and one entry per case)
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    if fake and 'pipeline' in modes:
+        print("⚠️  Skipping pipeline mode: it needs a FalkorDB server (use --server)")
+        modes = [mode for mode in modes if mode != 'pipeline']
+    cases = []
+    for size in sizes:
+        for fmt in formats:
+            path = os.path.join(data_dir, synthetic_file_name(size, seed, fmt, relation_weights))
+            if not os.path.exists(path):
+                print(f"🧪 Generating {path}...")
+                generate_synthetic_rdf(path, size, seed, relation_weights)
+            for mode in modes:
+                cases.append({
+                    'name': f"{mode}-{fmt}-{size}",
+                    'path': path, 'size': size, 'format': fmt, 'mode': mode,
+                    'graph': f"bench_{mode}_{fmt}_{size}", 'fake': fake, 'host': host, 'port': port,
+                    'batch_size': batch_size, 'max_in_flight': max_in_flight, 'workers': workers,
+                    'file_bytes': os.path.getsize(path)
+                })
+    
+    # One fresh process per case, so peak RSS is not inherited from earlier cases
+    context = multiprocessing.get_context('spawn')
+    runs = []
+    for case in cases:
+        print(f"⏱️  {case['name']}...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            run = pool.submit(run_case, case).result()
+        if 'error' in run:
+            print(f"❌ {case['name']}: {run['error']}")
+        else:
+            rps = run['phase_throughput'].get('relationships_per_sec', 0.0)
+            print(f"✅ {case['name']}: {run['elapsed_seconds']:.1f}s, "
+                  f"{rps:.0f} relationships/sec, peak RSS {run['peak_rss_mb']:.0f} MB")
+        runs.append(run)
+    
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'target': 'fake' if fake else f"{host}:{port}",
+        'cases': runs
+    }
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to: {output_path}")
+    return results
+
+def compare_benchmark_runs(baseline_path, current_path, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare two results files case by case
+    
+    A throughput metric that dropped, or a peak RSS that grew, by more than
+    `tolerance` (a fraction) counts as a regression.
+    
+    Returns:
+        dict with per-case metric changes and a list of regressions
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {case['name']: case for case in json.load(f)['cases'] if 'error' not in case}
+    with open(current_path, 'r', encoding='utf-8') as f:
+        current = {case['name']: case for case in json.load(f)['cases'] if 'error' not in case}
+    
+    changes = {}
+    regressions = []
+    for name in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[name], current[name]
+        metrics = {}
+        for key in THROUGHPUT_KEYS:
+            before = old['phase_throughput'].get(key)
+            after = new['phase_throughput'].get(key)
+            # A zero rate means the phase did not run separately (e.g. parallel parse)
+            if not before or not after:
+                continue
+            change = (after - before) / before
+            metrics[key] = {'baseline': before, 'current': after, 'change': change}
+            if change < -tolerance:
+                regressions.append(f"{name}: {key} {change:+.1%}")
+        before, after = old['peak_rss_mb'], new['peak_rss_mb']
+        if before:
+            change = (after - before) / before
+            metrics['peak_rss_mb'] = {'baseline': before, 'current': after, 'change': change}
+            if change > tolerance:
+                regressions.append(f"{name}: peak_rss_mb {change:+.1%}")
+        changes[name] = metrics
+    
+    return {
+        'baseline': baseline_path,
+        'current': current_path,
+        'tolerance': tolerance,
+        'cases': changes,
+        'only_in_baseline': sorted(baseline.keys() - current.keys()),
+        'only_in_current': sorted(current.keys() - baseline.keys()),
+        'regressions': regressions
+    }
+
+def print_comparison(comparison):
+    """Print a comparison from `compare_benchmark_runs`"""
+    print(f"📊 {comparison['current']} vs {comparison['baseline']} (tolerance {comparison['tolerance']:.0%})")
+    for name, metrics in comparison['cases'].items():
+        print(f"\n  {name}")
+        for key, values in metrics.items():
+            print(f"    {key}: {values['baseline']:,.0f} -> {values['current']:,.0f} ({values['change']:+.1%})")
+    for name in comparison['only_in_baseline'] + comparison['only_in_current']:
+        print(f"\n  ⚠️  {name} is only in one of the runs")
+    if comparison['regressions']:
+        print(f"\n❌ {len(comparison['regressions'])} regressions:")
+        for regression in comparison['regressions']:
+            print(f"  • {regression}")
+    else:
+        print("\n✅ No regressions")
+
+def main():
+    """Main function for command line usage"""
+    parser = argparse.ArgumentParser(description='Benchmark generic_rdf_loader on synthetic WordNet-shaped RDF')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    generate = commands.add_parser('generate', help='Write one synthetic RDF file')
+    generate.add_argument('output', help='Output file (.nt or .ttl)')
+    generate.add_argument('--triples', type=int, default=100000)
+    generate.add_argument('--seed', type=int, default=0)
+    generate.add_argument('--relation-weights', type=parse_relation_weights,
+                          help='Synset relation mix, e.g. hypernym=0.5,hyponym=0.3,antonym=0.2')
+    
+    run = commands.add_parser('run', help='Run the benchmark cases and save results')
+    run.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    run.add_argument('--formats', nargs='+', choices=['nt', 'ttl'], default=['nt'])
+    run.add_argument('--modes', nargs='+', choices=['table', 'stream', 'pipeline'], default=['table'])
+    run.add_argument('--server', action='store_true', help='Load into FalkorDB instead of the in-process fake')
+    run.add_argument('--host', default='localhost')
+    run.add_argument('--port', type=int, default=6379)
+    run.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    run.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT)
+    run.add_argument('--workers', type=int)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--relation-weights', type=parse_relation_weights,
+                     help='Synset relation mix, e.g. hypernym=0.5,hyponym=0.3,antonym=0.2')
+    run.add_argument('--data-dir', default='data/benchmark')
+    run.add_argument('-o', '--output', default='benchmark_results.json')
+    
+    compare = commands.add_parser('compare', help='Compare two results files')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    
+    args = parser.parse_args()
+    
+    if args.command == 'generate':
+        info = generate_synthetic_rdf(args.output, args.triples, args.seed, args.relation_weights)
+        print(f"✅ Wrote {info['triples']:,} triples ({info['bytes'] / (1024*1024):.1f} MB) to {info['path']}")
+    elif args.command == 'run':
+        run_benchmarks(args.sizes, args.formats, args.modes, args.data_dir, args.output,
+                       not args.server, args.host, args.port, args.batch_size,
+                       args.max_in_flight, args.workers, args.seed, args.relation_weights)
+    else:
+        comparison = compare_benchmark_runs(args.baseline, args.current, args.tolerance)
+        print_comparison(comparison)
+        sys.exit(1 if comparison['regressions'] else 0)
+
+if __name__ == "__main__":
+    main()
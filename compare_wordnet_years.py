@@ -1,6 +1,23 @@
 import json
 import argparse
+import difflib
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import re
+import sqlite3
+import sys
+import tempfile
 from datetime import datetime
+import time
+
+from run_metrics import JsonlMetrics, Metrics, PROFILERS
+
+_JSON_SEPARATORS = re.compile(r'[\s,]*')
+
+# List fields compared as multisets by the 'smart' list mode
+UNORDERED_LIST_FIELDS = ('synonyms', 'lemmas', 'members', 'relations')
 
 def load_wordnet_json(file_path):
     """Load WordNet JSON file"""
@@ -13,7 +30,442 @@ def load_wordnet_json(file_path):
         print(f"❌ Error loading {file_path}: {e}")
         return None
 
-def compare_wordnet_files(file1_path, file2_path, output_path=None):
+def iter_wordnet_json(file_path, chunk_size=1 << 20, with_spans=False):
+    """
+    Yield the entries of a WordNet JSON file one at a time
+
+    Accepts a top-level JSON array or JSON Lines; the file is read in
+    `chunk_size` pieces so only one entry is decoded in memory at a time.
+    With `with_spans=True` yields (entry, byte_offset, byte_length) so the
+    entry can later be read back directly from the file.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        byte_pos = 0  # byte offset in the file of buf[pos]
+        eof = False
+        
+        def fill():
+            nonlocal buf, pos, eof
+            data = f.read(chunk_size)
+            eof = not data
+            buf = buf[pos:] + data
+            pos = 0
+        
+        def skip_separators():
+            nonlocal pos, byte_pos
+            end = _JSON_SEPARATORS.match(buf, pos).end()
+            byte_pos += end - pos  # separators are ASCII
+            pos = end
+        
+        fill()
+        skip_separators()
+        if buf[pos:pos + 1] == '[':
+            pos += 1
+            byte_pos += 1
+        
+        while True:
+            skip_separators()
+            if pos >= len(buf):
+                if eof:
+                    return
+                fill()
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                entry, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if not eof and (end == len(buf) or (not isinstance(entry, (dict, list, str))
+                                                and buf[end] not in ' \t\r\n,]')):
+                fill()  # a bare number may continue in the next chunk
+                continue
+            if with_spans:
+                length = len(buf[pos:end].encode('utf-8'))
+                yield entry, byte_pos, length
+                byte_pos += length
+            pos = end
+            if not with_spans:
+                yield entry
+
+def entry_hash(entry):
+    """Stable content hash of an entry (key order does not matter)"""
+    canonical = json.dumps(entry, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+def field_hashes(entry):
+    """Per top-level field content hashes of an entry (hex, 8 bytes each)"""
+    return {
+        key: hashlib.blake2b(json.dumps(value, sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
+        for key, value in entry.items()
+    }
+
+def build_fingerprint_index(json_path, index_path=None, with_field_hashes=False):
+    """
+    Build a fingerprint index for one WordNet JSON release
+    
+    The index is a small SQLite file mapping every entry ID to its content
+    hash and to the byte range of the entry in `json_path`, optionally with
+    per-field hashes. Comparisons accept it in place of the older JSON file
+    and only read back entries whose hash differs.
+    
+    Args:
+        json_path: WordNet JSON file (array or JSON Lines)
+        index_path: where to write the index (default: json_path + '.fpidx')
+        with_field_hashes: also store a hash per top-level field
+    
+    Returns:
+        Path of the index file
+    """
+    if index_path is None:
+        index_path = json_path + '.fpidx'
+    tmp_path = index_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    
+    print(f"🔧 Building fingerprint index for {json_path}...")
+    stat = os.stat(json_path)
+    con = sqlite3.connect(tmp_path)
+    try:
+        con.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        con.execute("CREATE TABLE entries (id TEXT PRIMARY KEY, hash BLOB, offset INTEGER, "
+                    "length INTEGER, fields TEXT)")
+        
+        def rows():
+            for idx, (entry, offset, length) in enumerate(iter_wordnet_json(json_path, with_spans=True)):
+                fields = json.dumps(field_hashes(entry)) if with_field_hashes else None
+                yield json.dumps(entry.get('id', idx)), entry_hash(entry), offset, length, fields
+        
+        # Later duplicates replace earlier ones, like the dict in compare_wordnet_files
+        con.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", rows())
+        count = con.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        meta = {
+            'format': 'wordnet-fingerprint-index/1',
+            'source': os.path.abspath(json_path),
+            'source_size': str(stat.st_size),
+            'source_mtime_ns': str(stat.st_mtime_ns),
+            'entries': str(count),
+            'field_hashes': '1' if with_field_hashes else '0'
+        }
+        con.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp_path, index_path)
+    
+    print(f"✅ Fingerprint index saved to: {index_path} ({count} entries)")
+    return index_path
+
+def is_fingerprint_index(path):
+    """True if `path` is a fingerprint index rather than a JSON file"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(16) == b'SQLite format 3\x00'
+    except OSError:
+        return False
+
+class FingerprintIndex:
+    """Read access to a fingerprint index and the JSON file it describes"""
+    
+    def __init__(self, index_path):
+        self.path = index_path
+        self.con = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+        self.meta = dict(self.con.execute("SELECT key, value FROM meta"))
+        self.source = self.meta['source']
+        self.has_field_hashes = self.meta.get('field_hashes') == '1'
+        self._source_file = None
+    
+    def stale_reason(self):
+        """Why the index no longer matches its JSON file, or None"""
+        try:
+            stat = os.stat(self.source)
+        except OSError:
+            return f"source file {self.source} not found"
+        if str(stat.st_size) != self.meta['source_size'] or str(stat.st_mtime_ns) != self.meta['source_mtime_ns']:
+            return f"source file {self.source} changed since the index was built"
+        return None
+    
+    def hashes(self):
+        """ID -> content hash for every entry"""
+        return {json.loads(entry_id): digest for entry_id, digest in self.con.execute("SELECT id, hash FROM entries")}
+    
+    def field_hashes(self, entry_id):
+        row = self.con.execute("SELECT fields FROM entries WHERE id = ?", (json.dumps(entry_id),)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+    
+    def offsets(self, entry_ids):
+        """(entry_id, offset) pairs sorted by position in the source file"""
+        pairs = []
+        for entry_id in entry_ids:
+            row = self.con.execute("SELECT offset FROM entries WHERE id = ?", (json.dumps(entry_id),)).fetchone()
+            pairs.append((entry_id, row[0]))
+        return sorted(pairs, key=lambda pair: pair[1])
+    
+    def load_entry(self, entry_id):
+        """Read one entry back from the source JSON file"""
+        offset, length = self.con.execute(
+            "SELECT offset, length FROM entries WHERE id = ?", (json.dumps(entry_id),)
+        ).fetchone()
+        if self._source_file is None:
+            self._source_file = open(self.source, 'rb')
+        self._source_file.seek(offset)
+        return json.loads(self._source_file.read(length).decode('utf-8'))
+    
+    def close(self):
+        self.con.close()
+        if self._source_file is not None:
+            self._source_file.close()
+
+def open_fingerprint_index(path):
+    """Open `path` as a fingerprint index; raises ValueError if it is stale"""
+    index = FingerprintIndex(path)
+    reason = index.stale_reason()
+    if reason:
+        index.close()
+        raise ValueError(f"Fingerprint index {path} is stale: {reason}")
+    print(f"✅ Using fingerprint index {path}: {index.meta['entries']} entries")
+    return index
+
+def entry_differences(old_entry, new_entry, old_field_hashes=None, list_mode='position', structured=False):
+    """
+    Differences between two entries, skipping identical fields
+    
+    With the older entry's per-field hashes, only top-level fields whose hash
+    differs are compared; the result is the same as comparing everything.
+    Returns change records (`find_json_changes`) if `structured`, otherwise
+    the text lines of `find_json_differences`.
+    """
+    if old_field_hashes and isinstance(new_entry, dict):
+        new_hashes = field_hashes(new_entry)
+        changed = {key for key in set(old_field_hashes) | set(new_hashes)
+                   if old_field_hashes.get(key) != new_hashes.get(key)}
+        old_entry = {key: value for key, value in old_entry.items() if key in changed}
+        new_entry = {key: value for key, value in new_entry.items() if key in changed}
+    if structured:
+        return find_json_changes(old_entry, new_entry, list_mode=list_mode)
+    return find_json_differences(old_entry, new_entry, list_mode=list_mode)
+
+def compare_wordnet_files_streaming(file1_path, file2_path, output_path, list_mode='position', structured=False,
+                                    metrics=None):
+    """
+    Memory-bounded version of `compare_wordnet_files`
+    
+    Only an ID -> content hash map of the older file is kept in memory. Added,
+    removed and modified entries are written to `output_path` as JSON Lines
+    as soon as they are found (newer file entries that changed are spooled
+    to a temporary file until the older body is read back).
+    
+    Output lines: {"type": "comparison_info", ...}, then one
+    {"type": "added"|"removed"|"modified", "id", ...} per entry and finally
+    {"type": "statistics", ...}.
+    
+    `metrics` gets phase events for the three passes ('index', 'scan' and
+    'read_back'); see `compare_wordnet_files`.
+    
+    Returns:
+        Dictionary with comparison info, statistics and up to 5 samples per kind
+    """
+    print(f"🔍 Comparing WordNet files (streaming):")
+    print(f"  • File 1 (older): {file1_path}")
+    print(f"  • File 2 (newer): {file2_path}")
+    
+    info = {
+        'file1': file1_path,
+        'file2': file2_path,
+        'comparison_date': datetime.now().isoformat(),
+        'operation': 'file2 - file1 (newer minus older)'
+    }
+    counts = {'added': 0, 'removed': 0, 'modified': 0}
+    samples = {'added': [], 'removed': [], 'modified': []}
+    if metrics is None:
+        metrics = Metrics()
+    
+    index = None
+    phase = 'index'
+    try:
+        # Pass 1: hash every entry of the older file (or take the hashes from its index)
+        metrics.phase_start(phase)
+        if is_fingerprint_index(file1_path):
+            index = open_fingerprint_index(file1_path)
+            old_hashes = index.hashes()
+            total1 = len(old_hashes)
+        else:
+            old_hashes = {}
+            total1 = 0
+            for idx, entry in enumerate(iter_wordnet_json(file1_path)):
+                old_hashes[entry.get('id', idx)] = entry_hash(entry)
+                total1 += 1
+            print(f"✅ Indexed {file1_path}: {total1} entries")
+        metrics.phase_end(phase, total1)
+        
+        with open(output_path, 'w', encoding='utf-8') as out, \
+                tempfile.TemporaryFile('w+', encoding='utf-8') as spool:
+            
+            def emit(kind, record):
+                counts[kind] += 1
+                if len(samples[kind]) < 5:
+                    samples[kind].append(record)
+                out.write(json.dumps(dict(type=kind, **record), ensure_ascii=False) + '\n')
+            
+            out.write(json.dumps(dict(type='comparison_info', **info), ensure_ascii=False) + '\n')
+            
+            # Pass 2: added entries go straight out, changed ones to the spool
+            spooled = {}
+            total2 = 0
+            phase = 'scan'
+            metrics.phase_start(phase)
+            for idx, entry in enumerate(iter_wordnet_json(file2_path)):
+                total2 += 1
+                entry_id = entry.get('id', idx)
+                old_hash = old_hashes.pop(entry_id, None)
+                if old_hash is None:
+                    emit('added', {'id': entry_id, 'entry': entry})
+                elif old_hash != entry_hash(entry):
+                    spooled[entry_id] = spool.tell()
+                    spool.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            print(f"✅ Scanned {file2_path}: {total2} entries")
+            metrics.phase_end(phase, total2)
+            
+            # Pass 3: read back removed and modified bodies in older-file order
+            phase = 'read_back'
+            metrics.phase_start(phase)
+            removed_ids = old_hashes
+            if index is not None:
+                needed = index.offsets(list(removed_ids) + list(spooled))
+                old_entries = ((entry_id, index.load_entry(entry_id)) for entry_id, _ in needed)
+            else:
+                old_entries = ((entry.get('id', idx), entry)
+                               for idx, entry in enumerate(iter_wordnet_json(file1_path)))
+            for entry_id, entry in old_entries:
+                if removed_ids.pop(entry_id, None) is not None:
+                    emit('removed', {'id': entry_id, 'entry': entry})
+                    continue
+                offset = spooled.pop(entry_id, None)
+                if offset is not None:
+                    spool.seek(offset)
+                    new_entry = json.loads(spool.readline())
+                    spool.seek(0, os.SEEK_END)
+                    old_fields = index.field_hashes(entry_id) if index is not None and index.has_field_hashes else None
+                    emit('modified', {
+                        'id': entry_id,
+                        'old': entry,
+                        'new': new_entry,
+                        'differences': entry_differences(entry, new_entry, old_fields, list_mode, structured)
+                    })
+            
+            statistics = {
+                'total_file1_entries': total1,
+                'total_file2_entries': total2,
+                'added_entries': counts['added'],
+                'removed_entries': counts['removed'],
+                'modified_entries': counts['modified']
+            }
+            out.write(json.dumps(dict(type='statistics', **statistics)) + '\n')
+            metrics.phase_end(phase, counts['removed'] + counts['modified'])
+    except (OSError, ValueError, sqlite3.Error) as e:
+        metrics.phase_end(phase)
+        print(f"❌ Error comparing files: {e}")
+        return None
+    finally:
+        if index is not None:
+            index.close()
+    
+    print(f"✅ Comparison saved to: {output_path}")
+    
+    # Print summary
+    print(f"\n📊 COMPARISON SUMMARY:")
+    print(f"  • Total entries in file 1: {total1}")
+    print(f"  • Total entries in file 2: {total2}")
+    print(f"  • Added entries: {counts['added']}")
+    print(f"  • Removed entries: {counts['removed']}")
+    print(f"  • Modified entries: {counts['modified']}")
+    
+    return {
+        'comparison_info': info,
+        'statistics': statistics,
+        'samples': samples
+    }
+
+def shard_of(entry_id, shards):
+    """Stable shard number of an entry ID (same in every process and run)"""
+    key = json.dumps(entry_id).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big') % shards
+
+def _diff_shard(task):
+    """
+    Process-pool worker: field-level differences for one shard of common IDs
+    
+    Returns (shard, [(position, differences), ...]) for the modified entries;
+    `position` is the entry's place in the serial iteration order.
+    """
+    shard, pairs, list_mode, structured = task
+    found = []
+    for position, entry1, entry2 in pairs:
+        if json.dumps(entry1, sort_keys=True) != json.dumps(entry2, sort_keys=True):
+            found.append((position, entry_differences(entry1, entry2, None, list_mode, structured)))
+    return shard, found
+
+def diff_common_entries_parallel(common_ids, dict1, dict2, workers, added_ids=(), removed_ids=(),
+                                 list_mode='position', structured=False, metrics=None):
+    """
+    Modified-entry detection for `compare_wordnet_files` across processes
+    
+    IDs are split into `workers * 4` shards by hash. Every shard reports its
+    added/removed/modified counts when it finishes; the modified entries are
+    put back in `common_ids` order, so the result equals the serial loop.
+    Each finished shard is reported to `metrics` as a committed 'diff' batch.
+    
+    Returns:
+        List of modified-entry records
+    """
+    shards = workers * 4
+    common_ids = list(common_ids)
+    tasks = [[] for _ in range(shards)]
+    for position, entry_id in enumerate(common_ids):
+        tasks[shard_of(entry_id, shards)].append((position, dict1[entry_id], dict2[entry_id]))
+    added_per_shard = [0] * shards
+    removed_per_shard = [0] * shards
+    for entry_id in added_ids:
+        added_per_shard[shard_of(entry_id, shards)] += 1
+    for entry_id in removed_ids:
+        removed_per_shard[shard_of(entry_id, shards)] += 1
+    
+    print(f"⚙️  Diffing {len(common_ids)} common entries in {shards} shards on {workers} workers...")
+    found = []
+    rows_done = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_diff_shard, (shard, pairs, list_mode, structured))
+                   for shard, pairs in enumerate(tasks)]
+        for done, future in enumerate(as_completed(futures), 1):
+            shard, shard_found = future.result()
+            found.extend(shard_found)
+            if metrics:
+                elapsed = time.perf_counter() - start
+                rows_done += len(tasks[shard])
+                metrics.batch_committed('diff', len(tasks[shard]), rows_done,
+                                        rows_done / elapsed if elapsed > 0 else 0.0, elapsed)
+            print(f"  [{done}/{shards}] shard {shard}: +{added_per_shard[shard]} "
+                  f"-{removed_per_shard[shard]} ~{len(shard_found)}")
+    
+    found.sort(key=lambda item: item[0])
+    return [
+        {
+            'id': common_ids[position],
+            'old': dict1[common_ids[position]],
+            'new': dict2[common_ids[position]],
+            'differences': differences
+        }
+        for position, differences in found
+    ]
+
+def compare_wordnet_files(file1_path, file2_path, output_path=None, workers=None,
+                          list_mode='position', structured=False, metrics=None):
     """
     Compare two WordNet JSON files and find differences (file2 - file1)
     
@@ -21,6 +473,11 @@ def compare_wordnet_files(file1_path, file2_path, output_path=None):
         file1_path: Path to older WordNet file (e.g., 2024)
         file2_path: Path to newer WordNet file (e.g., 2025)
         output_path: Path to save difference JSON (optional)
+        workers: diff common entries in this many processes (JSON input only)
+        list_mode: 'position' or 'smart' list comparison (see `find_json_changes`)
+        structured: report differences as {path, op, old, new} records
+        metrics: `run_metrics.Metrics` sink for the 'load', 'diff' and 'save'
+                 phases (default: quiet)
     
     Returns:
         Dictionary with added, removed, and modified entries
@@ -29,20 +486,43 @@ def compare_wordnet_files(file1_path, file2_path, output_path=None):
     print(f"  • File 1 (older): {file1_path}")
     print(f"  • File 2 (newer): {file2_path}")
     
-    # Load both files
-    data1 = load_wordnet_json(file1_path)
+    if metrics is None:
+        metrics = Metrics()
+    
+    # Load both files (file 1 may be a fingerprint index of the older release)
+    metrics.phase_start('load')
+    index = None
+    if is_fingerprint_index(file1_path):
+        try:
+            index = open_fingerprint_index(file1_path)
+        except (ValueError, sqlite3.Error) as e:
+            metrics.phase_end('load')
+            print(f"❌ Error loading {file1_path}: {e}")
+            return None
+        old_hashes = index.hashes()
+        data1 = old_hashes
+        dict1 = None
+    else:
+        data1 = load_wordnet_json(file1_path)
     data2 = load_wordnet_json(file2_path)
     
     if not data1 or not data2:
+        metrics.phase_end('load')
+        if index is not None:
+            index.close()
         return None
     
     # Convert to dictionaries with IDs as keys for easier comparison
-    dict1 = {entry.get('id', idx): entry for idx, entry in enumerate(data1)}
+    if index is None:
+        dict1 = {entry.get('id', idx): entry for idx, entry in enumerate(data1)}
     dict2 = {entry.get('id', idx): entry for idx, entry in enumerate(data2)}
+    metrics.phase_end('load', len(data1) + len(data2))
+    metrics.phase_start('diff')
     
     # Find differences
-    ids1 = set(dict1.keys())
+    ids1 = set(old_hashes) if index is not None else set(dict1.keys())
     ids2 = set(dict2.keys())
+    old_entry = index.load_entry if index is not None else dict1.__getitem__
     
     # Added entries (in file2 but not in file1)
     added_ids = ids2 - ids1
@@ -50,16 +530,37 @@ def compare_wordnet_files(file1_path, file2_path, output_path=None):
     
     # Removed entries (in file1 but not in file2)
     removed_ids = ids1 - ids2
-    removed_entries = [dict1[id] for id in removed_ids]
+    removed_entries = [old_entry(id) for id in removed_ids]
     
     # Modified entries (in both but different)
     common_ids = ids1.intersection(ids2)
     modified_entries = []
     
+    if workers and workers > 1 and index is None:
+        modified_entries = diff_common_entries_parallel(
+            common_ids, dict1, dict2, workers, added_ids, removed_ids, list_mode, structured, metrics
+        )
+        common_ids = ()
+    
     for id in common_ids:
-        entry1 = dict1[id]
         entry2 = dict2[id]
         
+        if index is not None:
+            # Only entries whose hash differs are read back from the older file
+            if old_hashes[id] == entry_hash(entry2):
+                continue
+            entry1 = old_entry(id)
+            old_fields = index.field_hashes(id) if index.has_field_hashes else None
+            modified_entries.append({
+                'id': id,
+                'old': entry1,
+                'new': entry2,
+                'differences': entry_differences(entry1, entry2, old_fields, list_mode, structured)
+            })
+            continue
+        
+        entry1 = dict1[id]
+        
         # Convert to JSON strings for comparison (ignoring order)
         str1 = json.dumps(entry1, sort_keys=True)
         str2 = json.dumps(entry2, sort_keys=True)
@@ -69,9 +570,13 @@ def compare_wordnet_files(file1_path, file2_path, output_path=None):
                 'id': id,
                 'old': entry1,
                 'new': entry2,
-                'differences': find_json_differences(entry1, entry2)
+                'differences': entry_differences(entry1, entry2, None, list_mode, structured)
             })
     
+    if index is not None:
+        index.close()
+    metrics.phase_end('diff', len(ids1 | ids2))
+    
     # Create result dictionary
     result = {
         'comparison_info': {
@@ -94,12 +599,14 @@ def compare_wordnet_files(file1_path, file2_path, output_path=None):
     
     # Save to file if output path provided
     if output_path:
+        metrics.phase_start('save')
         try:
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(result, f, indent=2, ensure_ascii=False)
             print(f"✅ Comparison saved to: {output_path}")
         except Exception as e:
             print(f"❌ Error saving output: {e}")
+        metrics.phase_end('save')
     
     # Print summary
     print(f"\n📊 COMPARISON SUMMARY:")
@@ -124,55 +631,174 @@ def compare_wordnet_files(file1_path, file2_path, output_path=None):
         for i, mod in enumerate(modified_entries[:3], 1):
             print(f"  {i}. ID: {mod['id']}")
             for diff in mod['differences'][:2]:  # Show first 2 differences
-                print(f"     - {diff}")
+                print(f"     - {format_change(diff) if structured else diff}")
     
     return result
 
-def find_json_differences(obj1, obj2, path=""):
-    """Find differences between two JSON objects"""
-    differences = []
+def _canonical(value):
+    """Hashable canonical form of a JSON value (for matching list elements)"""
+    return json.dumps(value, sort_keys=True)
+
+def _list_changes(list1, list2, path, list_mode, unordered_fields):
+    """Changes between two lists (see `find_json_changes`)"""
+    changes = []
+    
+    if list_mode == 'position':
+        # Simple list comparison - for WordNet, usually lists of strings
+        if len(list1) != len(list2):
+            changes.append({'path': path, 'op': 'resize', 'old': len(list1), 'new': len(list2)})
+        
+        # Compare elements
+        for i, (item1, item2) in enumerate(zip(list1, list2)):
+            if item1 != item2:
+                changes.append({'path': f"{path}[{i}]", 'op': 'change', 'old': item1, 'new': item2})
+        return changes
+    
+    field = path.rsplit('.', 1)[-1]
+    keys1 = [_canonical(item) for item in list1]
+    keys2 = [_canonical(item) for item in list2]
+    
+    if field in unordered_fields:
+        # Multiset semantics: only members that appear more/less often matter
+        extra = Counter(keys2)
+        extra.subtract(keys1)
+        for item, key in zip(list1, keys1):
+            if extra[key] < 0:
+                extra[key] += 1
+                changes.append({'path': f"{path}[]", 'op': 'remove', 'old': item, 'new': None})
+        for item, key in zip(list2, keys2):
+            if extra[key] > 0:
+                extra[key] -= 1
+                changes.append({'path': f"{path}[]", 'op': 'add', 'old': None, 'new': item})
+        return changes
+    
+    # Ordered list: minimal edit script (matching blocks of equal elements)
+    matcher = difflib.SequenceMatcher(None, keys1, keys2, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        paired = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+        for k in range(paired):
+            changes.extend(find_json_changes(list1[i1 + k], list2[j1 + k], f"{path}[{j1 + k}]",
+                                             list_mode, unordered_fields))
+        for i in range(i1 + paired, i2):
+            changes.append({'path': f"{path}[{i}]", 'op': 'remove', 'old': list1[i], 'new': None})
+        for j in range(j1 + paired, j2):
+            changes.append({'path': f"{path}[{j}]", 'op': 'add', 'old': None, 'new': list2[j]})
+    return changes
+
+def find_json_changes(obj1, obj2, path="", list_mode='position', unordered_fields=UNORDERED_LIST_FIELDS):
+    """
+    Find differences between two JSON objects as structured records
+    
+    Each change is {'path', 'op', 'old', 'new'} with op one of 'add',
+    'remove', 'change' or 'resize' (list length, position mode only).
+    
+    Args:
+        obj1: older value
+        obj2: newer value
+        path: path of the values inside the entry
+        list_mode: 'position' compares lists index by index; 'smart' treats
+                   lists named in `unordered_fields` as multisets and diffs
+                   other lists with an edit script, so one inserted element
+                   is one change instead of a changed tail
+        unordered_fields: names of list fields whose order does not matter
+    
+    Returns:
+        List of change records
+    """
+    changes = []
     
     if isinstance(obj1, dict) and isinstance(obj2, dict):
-        all_keys = set(obj1.keys()) | set(obj2.keys())
+        # Ordered (not a set) so results do not depend on the hash seed
+        all_keys = list(obj1.keys()) + [key for key in obj2.keys() if key not in obj1]
         
         for key in all_keys:
             new_path = f"{path}.{key}" if path else key
             
             if key in obj1 and key in obj2:
-                differences.extend(
-                    find_json_differences(obj1[key], obj2[key], new_path)
+                changes.extend(
+                    find_json_changes(obj1[key], obj2[key], new_path, list_mode, unordered_fields)
                 )
             elif key in obj1:
-                differences.append(f"{new_path}: removed (was: {obj1[key]})")
+                changes.append({'path': new_path, 'op': 'remove', 'old': obj1[key], 'new': None})
             else:
-                differences.append(f"{new_path}: added (is: {obj2[key]})")
+                changes.append({'path': new_path, 'op': 'add', 'old': None, 'new': obj2[key]})
     
     elif isinstance(obj1, list) and isinstance(obj2, list):
-        # Simple list comparison - for WordNet, usually lists of strings
-        if len(obj1) != len(obj2):
-            differences.append(f"{path}: list length changed from {len(obj1)} to {len(obj2)}")
-        
-        # Compare elements
-        for i, (item1, item2) in enumerate(zip(obj1, obj2)):
-            if item1 != item2:
-                differences.append(f"{path}[{i}]: changed from '{item1}' to '{item2}'")
+        changes.extend(_list_changes(obj1, obj2, path, list_mode, unordered_fields))
     
     elif obj1 != obj2:
-        differences.append(f"{path}: changed from '{obj1}' to '{obj2}'")
+        changes.append({'path': path, 'op': 'change', 'old': obj1, 'new': obj2})
     
-    return differences
+    return changes
+
+def format_change(change):
+    """One-line text form of a change record"""
+    path, op, old, new = change['path'], change['op'], change['old'], change['new']
+    if op == 'remove':
+        return f"{path}: removed (was: {old})"
+    if op == 'add':
+        return f"{path}: added (is: {new})"
+    if op == 'resize':
+        return f"{path}: list length changed from {old} to {new}"
+    return f"{path}: changed from '{old}' to '{new}'"
+
+def find_json_differences(obj1, obj2, path="", list_mode='position'):
+    """Find differences between two JSON objects"""
+    return [format_change(change) for change in find_json_changes(obj1, obj2, path, list_mode)]
 
 def main():
     """Main function for command line usage"""
     parser = argparse.ArgumentParser(description='Compare two WordNet JSON files')
-    parser.add_argument('file1', help='Older WordNet JSON file (e.g., 2024)')
-    parser.add_argument('file2', help='Newer WordNet JSON file (e.g., 2025)')
+    parser.add_argument('file1', help='Older WordNet JSON file (e.g., 2024) or its fingerprint index')
+    parser.add_argument('file2', nargs='?', help='Newer WordNet JSON file (e.g., 2025)')
     parser.add_argument('-o', '--output', help='Output JSON file for differences')
+    parser.add_argument('--stream', action='store_true',
+                        help='Memory-bounded comparison; writes JSON Lines to --output')
+    parser.add_argument('--build-index', action='store_true',
+                        help='Build a fingerprint index for file1 (written to -o or file1.fpidx)')
+    parser.add_argument('--field-hashes', action='store_true',
+                        help='With --build-index: also store per-field hashes')
+    parser.add_argument('--workers', type=int,
+                        help='Diff common entries in this many processes')
+    parser.add_argument('--list-mode', choices=['position', 'smart'], default='position',
+                        help="'smart': unordered lists as multisets, ordered lists by edit script")
+    parser.add_argument('--structured', action='store_true',
+                        help='Write differences as {path, op, old, new} records instead of text')
+    parser.add_argument('--metrics', help='Append phase/batch/memory events to this JSON Lines file')
+    parser.add_argument('--profile-phase', help="Profile one phase (e.g. 'diff')")
+    parser.add_argument('--profiler', choices=PROFILERS, default='cprofile')
+    parser.add_argument('--profile-output', help='With --profiler cprofile: save stats here instead of printing')
     
     args = parser.parse_args()
     
+    if args.build_index:
+        build_fingerprint_index(args.file1, args.output, args.field_hashes)
+        return
+    if not args.file2:
+        parser.error('file2 is required unless --build-index is given')
+    
+    if args.stream:
+        if not args.output:
+            parser.error('--stream requires --output')
+        if args.workers:
+            parser.error('--workers is not supported with --stream')
+    
+    profile = {'profile_phase': args.profile_phase, 'profiler': args.profiler,
+               'profile_output': args.profile_output}
+    metrics = JsonlMetrics(args.metrics, **profile) if args.metrics else Metrics(**profile)
+    
     # Run comparison
-    result = compare_wordnet_files(args.file1, args.file2, args.output)
+    try:
+        if args.stream:
+            result = compare_wordnet_files_streaming(args.file1, args.file2, args.output,
+                                                     args.list_mode, args.structured, metrics)
+        else:
+            result = compare_wordnet_files(args.file1, args.file2, args.output, args.workers,
+                                           args.list_mode, args.structured, metrics)
+    finally:
+        metrics.close()
     
     if result:
         print(f"\n✅ Comparison completed successfully!")
@@ -186,6 +812,10 @@ if __name__ == "__main__":
     print("🔍 WordNet Year Comparison Tool")
     print("="*50)
     
+    if len(sys.argv) > 1:
+        main()
+        sys.exit()
+    
     # You would use it like:
     # python compare_wordnet_years.py wordnet-2024.json wordnet-2025.json -o differences.json
     
@@ -47,8 +47,9 @@ def task_3_generic_rdf_loader():
     print("   • Turtle (.ttl) files")
     print("   • RDF/XML (.rdf, .xml) files")
     print("   • JSON-LD (.jsonld) files")
-    print("   • N-Triples (.nt) files")
+    print("   • N-Triples (.nt) and N-Quads (.nq) files (fast line tokenizer)")
     print("   • N3 (.n3) files")
+    print("   • gzip/bz2-compressed versions of any of them (format auto-detected)")
     
     # Test with a small sample
     if os.path.exists('data/english-wordnet-2024.ttl'):
@@ -1,8 +1,98 @@
-from rdflib import Graph
+from rdflib import Graph, Literal
+from rdflib.plugins.parsers.notation3 import RDFSink, SinkParser
 from falkordb import FalkorDB
+from falkordb.asyncio import FalkorDB as AsyncFalkorDB
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice, repeat
+from array import array
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError, ResponseError
+import asyncio
+import bz2
+import csv
+import gzip
+import hashlib
+import json
+import mmap
 import os
+import pathlib
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
 import time
 import re
+import zlib
+
+from run_metrics import Metrics
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_MAX_IN_FLIGHT = 4
+PREDICATE_CACHE_SIZE = 4096
+
+NODE_BATCH_QUERY = "UNWIND $rows AS r CREATE (:Resource {id: r[0], uri: r[1]})"
+NODE_PROPS_BATCH_QUERY = "UNWIND $rows AS r CREATE (n:Resource {id: r[0], uri: r[1]}) SET n += r[2]"
+NODE_INDEXES = ('id', 'uri')
+REL_TYPE_PATTERN = re.compile(r'^[A-Za-z0-9_]+$')
+RDF_TYPE = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'
+
+# Index planning: labels this size or larger get their own uri index
+LABEL_INDEX_MIN_NODES = 1000
+INDEX_BUILD_TIMEOUT = 600
+INDEX_POLL_SECONDS = 0.2
+
+# Post-load verification: sampled triples looked up per type, in batches
+VERIFY_SAMPLE_SIZE = 1000
+VERIFY_BATCH_SIZE = 500
+
+# rdflib parser format by extension (under any .gz/.bz2 suffix); other files are sniffed
+RDF_FORMATS = {
+    '.ttl': 'turtle', '.turtle': 'turtle', '.nt': 'nt', '.ntriples': 'nt', '.nq': 'nquads',
+    '.n3': 'n3', '.rdf': 'xml', '.xml': 'xml', '.owl': 'xml', '.jsonld': 'json-ld',
+    '.json': 'json-ld', '.trig': 'trig'
+}
+COMPRESSION_SUFFIXES = ('.gz', '.bz2')
+COMPRESSION_MAGIC = {b'\x1f\x8b': 'gzip', b'BZh': 'bz2'}
+SNIFF_CHARS = 4096
+
+# Formats read without building an rdflib Graph (line formats use the N-Triples tokenizer)
+STREAM_FORMATS = ('nt', 'nquads', 'turtle')
+LINE_FORMATS = ('nt', 'nquads')
+TURTLE_CHUNK_LINES = 20000
+# A Turtle chunk that still fails to parse at this many times chunk_lines is an error
+TURTLE_MAX_CHUNK_FACTOR = 10
+
+# Parsed-triple cache (see `TripleCache`)
+TRIPLE_CACHE_VERSION = 4
+TRIPLE_CACHE_MAX_BYTES = 4 * 1024 ** 3
+
+# Chunks each pipeline queue may hold before its producer has to wait
+PIPELINE_QUEUE_CHUNKS = 4
+
+# Layout read by `falkordb-bulk-insert --enforce-schema --id-type INTEGER`
+BULK_INSERT_TOOL = 'falkordb-bulk-insert'
+BULK_MANIFEST = 'manifest.json'
+BULK_NODE_FILE = 'Resource.csv'
+BULK_NODE_HEADER = ['id:ID(Resource)', 'uri:STRING']
+BULK_EDGE_HEADER = [':START_ID(Resource)', ':END_ID(Resource)']
+BULK_LABEL_HEADER = ['id']
+BULK_CSV_FORMAT = {'quoting': csv.QUOTE_NONNUMERIC, 'escapechar': '\\', 'doublequote': False, 'lineterminator': '\n'}
+BULK_REPLAY_BATCH_SIZE = 50000
+
+# redis-py error text for a connection that never opened, i.e. the query was not sent
+_CONNECT_FAILURE = re.compile(r'connecting to|Connection refused', re.IGNORECASE)
+
+_NT_TERM = r'(<[^>]*>|_:\S+|"(?:[^"\\]|\\.)*"(?:@[A-Za-z0-9-]+|\^\^<[^>]*>)?)'
+_NT_LINE = re.compile(
+    r'^\s*(<[^>]*>|_:\S+)\s+(<[^>]*>)\s+' + _NT_TERM + r'(?:\s+(?:<[^>]*>|_:\S+))?\s*\.\s*(?:#.*)?$'
+)
+_TURTLE_DIRECTIVE = re.compile(r'(?:@prefix|@base)\b|(?:prefix|base)\s', re.IGNORECASE)
+_TURTLE_PREFIX_NAME = re.compile(r'@?prefix\s+([^\s:]*):', re.IGNORECASE)
+_NT_ESCAPE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+_NT_CHARS = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
 
 def clean_relationship_name(name):
     """Clean relationship names for FalkorDB"""
@@ -15,9 +105,1937 @@ def clean_relationship_name(name):
         clean = 'RELATED'
     return clean[:50]
 
-def load_any_rdf_to_falkordb(rdf_file_path, graph_name=None, host='localhost', port=6379, sample_size=None):
+def predicate_rel_type(pred):
+    """Relationship type for a predicate IRI: its cleaned local name"""
+    pred_str = str(pred)
+    if '#' in pred_str:
+        pred_name = pred_str.split('#')[-1]
+    else:
+        pred_name = pred_str.split('/')[-1]
+    return clean_relationship_name(pred_name)
+
+class PredicateCache:
+    """
+    Memoized predicate IRI -> relationship type lookup
+
+    Entries imported from a relationship-type table are pinned and always
+    win; everything else is computed by `predicate_rel_type` and kept in a
+    bounded LRU. Hit/miss counters end up in the loader stats.
+    """
+    
+    def __init__(self, table=None, maxsize=PREDICATE_CACHE_SIZE):
+        self.table = dict(table or {})
+        self.maxsize = maxsize
+        self.lru = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def rel_type(self, pred):
+        pred_str = str(pred)
+        rel_type = self.table.get(pred_str)
+        if rel_type is not None:
+            self.hits += 1
+            return rel_type
+        rel_type = self.lru.get(pred_str)
+        if rel_type is not None:
+            self.hits += 1
+            self.lru.move_to_end(pred_str)
+            return rel_type
+        self.misses += 1
+        rel_type = predicate_rel_type(pred_str)
+        self.lru[pred_str] = rel_type
+        if len(self.lru) > self.maxsize:
+            self.lru.popitem(last=False)
+            self.evictions += 1
+        return rel_type
+    
+    def mapping(self):
+        """Every known predicate -> type pair (pinned table plus LRU contents)"""
+        mapping = dict(self.lru)
+        mapping.update(self.table)
+        return mapping
+    
+    def preload(self, mapping):
+        """Add known predicate -> type pairs (e.g. from a triple cache) without counting lookups"""
+        for pred_str, rel_type in mapping.items():
+            if pred_str not in self.table:
+                self.lru[pred_str] = rel_type
+        while len(self.lru) > self.maxsize:
+            self.lru.popitem(last=False)
+    
+    def absorb(self, other):
+        """Fold in the counters and entries of a worker process's cache"""
+        self.hits += other.hits
+        self.misses += other.misses
+        self.evictions += other.evictions
+        for pred_str, rel_type in other.lru.items():
+            if pred_str not in self.table:
+                self.lru[pred_str] = rel_type
+        while len(self.lru) > self.maxsize:
+            self.lru.popitem(last=False)
+    
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.lru),
+            'maxsize': self.maxsize,
+            'pinned': len(self.table)
+        }
+
+def load_relationship_type_table(path):
+    """Read a predicate IRI -> relationship type table written by `save_relationship_type_table`"""
+    with open(path, 'r', encoding='utf-8') as f:
+        table = json.load(f)
+    if not isinstance(table, dict) or not all(isinstance(v, str) for v in table.values()):
+        raise ValueError(f"{path}: expected a JSON object of predicate IRI -> relationship type")
+    # Types are spliced into query templates, so only accept what clean_relationship_name produces
+    for pred_str, rel_type in table.items():
+        if not REL_TYPE_PATTERN.match(rel_type):
+            raise ValueError(f"{path}: invalid relationship type {rel_type!r} for {pred_str}")
+    return table
+
+def save_relationship_type_table(path, mapping):
+    """Write the predicate IRI -> relationship type table as sorted JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(mapping, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+class LiteralText(str):
+    """
+    Text of an N-Triples literal object (IRIs and blank nodes stay plain `str`)
+    
+    `suffix` keeps the rest of the term (closing quote plus language tag or
+    datatype), which only duplicate detection looks at.
+    """
+    __slots__ = ('suffix',)
+
+def is_literal(term):
+    """True for rdflib Literals and literals from the N-Triples parser"""
+    return isinstance(term, (Literal, LiteralText))
+
+def class_label(class_uri):
+    """Node label for an rdf:type class IRI: its cleaned local name"""
+    return predicate_rel_type(class_uri)
+
+def literal_property_name(rel_type):
+    """Node property holding a literal predicate's values (never clobbers `id`/`uri`)"""
+    return f"{rel_type}_value" if rel_type in NODE_INDEXES else rel_type
+
+def normalize_triple(subj, pred, obj, predicates=None):
+    """
+    Turn one parsed triple into (subject_uri, relationship_type, object_uri)
+
+    Terms may be rdflib terms or plain strings; both are handled the same way.
+    `predicates` is an optional PredicateCache used for the relationship type.
+    Terms are kept in full: they are always sent as query parameters, so
+    length, quotes and backslashes need no special handling.
+    """
+    subj_uri = str(subj)
+    obj_uri = str(obj)
+    
+    if predicates is None:
+        return subj_uri, predicate_rel_type(pred), obj_uri
+    return subj_uri, predicates.rel_type(pred), obj_uri
+
+def triple_term_key(pred, obj):
+    """
+    32-bit key of what `normalize_triple` drops from a triple: the full
+    predicate IRI and whether and how the object is a literal
+    
+    Two triples that normalize alike are the same RDF triple only if their
+    keys match too (see `TripleTable.dedupe`).
+    """
+    return _term_key(pred, getattr(obj, 'suffix', ''))
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def _term_key(pred, suffix):
+    # A file has few distinct (predicate, literal tag) pairs
+    return zlib.crc32(f"{pred}\x00{suffix}".encode('utf-8'))
+
+def add_triple(table, subj, pred, obj, predicates=None, literal_properties=False):
+    """
+    Normalize one triple into a TripleTable
+
+    With `literal_properties`, a literal object is kept in full as a property
+    value of its subject instead of becoming a node and an edge. Only its
+    text is stored; the language tag and datatype are dropped.
+    """
+    subj_uri, rel_type, obj_uri = normalize_triple(subj, pred, obj, predicates)
+    term_key = triple_term_key(pred, obj) if table.edge_terms is not None else 0
+    if literal_properties and is_literal(obj):
+        table.add_literal(subj_uri, literal_property_name(rel_type), str(obj), term_key)
+    else:
+        table.add(subj_uri, rel_type, obj_uri, term_key)
+        if str(pred) == RDF_TYPE and not is_literal(obj):
+            table.add_label(subj_uri, class_label(obj))
+
+def _nt_unescape(text):
+    """Resolve N-Triples string escapes (\\n, \\", \\uXXXX, ...)"""
+    if '\\' not in text:
+        return text
+    
+    def replace(match):
+        code = match.group(1) or match.group(2)
+        if code:
+            return chr(int(code, 16))
+        return _NT_CHARS.get(match.group(3), match.group(3))
+    
+    return _NT_ESCAPE.sub(replace, text)
+
+def _nt_term(token):
+    """Return the same text `str()` gives for the equivalent rdflib term"""
+    if token[0] == '<':
+        return _nt_unescape(token[1:-1])
+    if token[0] == '_':
+        return token[2:]
+    end = token.rindex('"')
+    text = LiteralText(_nt_unescape(token[1:end]))
+    text.suffix = token[end:]
+    return text
+
+def parse_ntriples_line(line):
+    """
+    Parse one N-Triples/N-Quads line into (subject, predicate, object) strings
+
+    Returns None for blank and comment lines; the graph label is ignored.
+    """
+    line = line.strip()
+    if not line or line[0] == '#':
+        return None
+    match = _NT_LINE.match(line)
+    if not match:
+        raise ValueError("not a valid N-Triples statement")
+    subj, pred, obj = match.groups()
+    return _nt_term(subj), _nt_term(pred), _nt_term(obj)
+
+def detect_compression(rdf_file_path):
+    """'gzip', 'bz2' or None, from the file's magic bytes"""
+    with open(rdf_file_path, 'rb') as f:
+        head = f.read(3)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+def open_rdf(rdf_file_path, mode='rt', compression=None):
+    """Open an RDF file for reading, decompressing gzip/bz2 transparently"""
+    if compression is None:
+        compression = detect_compression(rdf_file_path)
+    opener = {'gzip': gzip.open, 'bz2': bz2.open}.get(compression, open)
+    if 'b' in mode:
+        return opener(rdf_file_path, mode)
+    return opener(rdf_file_path, mode, encoding='utf-8')
+
+def rdf_base_name(rdf_file_path):
+    """File name without its RDF extension and any .gz/.bz2 suffix"""
+    stem, ext = os.path.splitext(os.path.basename(rdf_file_path))
+    if ext.lower() in COMPRESSION_SUFFIXES:
+        stem = os.path.splitext(stem)[0]
+    return stem
+
+def sniff_rdf_format(text):
+    """
+    Guess the rdflib format from the start of a file
+
+    XML and JSON are recognized by their first character. Otherwise the text
+    is N-Triples only if every complete line is an N-Triples statement (or a
+    comment); anything else is read as Turtle, which also covers N-Triples.
+    """
+    head = text.lstrip('\ufeff \t\r\n')
+    if head.startswith('<?xml') or head.startswith('<rdf:RDF'):
+        return 'xml'
+    if head.startswith(('{', '[')):
+        return 'json-ld'
+    lines = head.splitlines()
+    if lines and not head.endswith('\n'):
+        lines.pop()  # cut off by the sniff length
+    statements = [line.strip() for line in lines if line.strip() and line.strip()[0] != '#']
+    if statements and all(_NT_LINE.match(line) for line in statements):
+        return 'nt'
+    return 'turtle'
+
+def detect_rdf_format(rdf_file_path):
+    """
+    Parser format and compression of an RDF file
+
+    Compression comes from the magic bytes, so a mislabelled file still
+    opens. The format comes from the extension under any .gz/.bz2 suffix,
+    or is sniffed from the first few KB when the extension is unknown.
+
+    Returns:
+        (format, compression) with an rdflib format name ('turtle', 'nt',
+        'nquads', 'xml', 'json-ld', ...) and 'gzip', 'bz2' or None
+    """
+    compression = detect_compression(rdf_file_path)
+    stem, ext = os.path.splitext(rdf_file_path.lower())
+    if ext in COMPRESSION_SUFFIXES:
+        ext = os.path.splitext(stem)[1]
+    rdf_format = RDF_FORMATS.get(ext)
+    if rdf_format is None:
+        with open_rdf(rdf_file_path, 'rt', compression) as f:
+            rdf_format = sniff_rdf_format(f.read(SNIFF_CHARS))
+    return rdf_format, compression
+
+def iter_ntriples(rdf_file_path):
+    """
+    Yield (subject, predicate, object) strings from an N-Triples/N-Quads file
+
+    Reads one line at a time (gzip/bz2 input is decompressed on the fly).
+    """
+    with open_rdf(rdf_file_path) as f:
+        for line_no, line in enumerate(f, 1):
+            try:
+                triple = parse_ntriples_line(line)
+            except ValueError as e:
+                raise ValueError(f"{rdf_file_path}:{line_no}: {e}") from None
+            if triple is not None:
+                yield triple
+
+def split_line_ranges(rdf_file_path, parts):
+    """Split a file into about `parts` (start, end) byte ranges on line boundaries"""
+    size = os.path.getsize(rdf_file_path)
+    bounds = [0]
+    with open(rdf_file_path, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts, bounds[-1]))
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+class TripleTable:
+    """
+    Interned nodes and per-relationship-type edge columns
+
+    Every URI is stored once and gets a dense integer ID (its position in
+    `uris`). Edges are kept per type as two `array('I')` columns of source and
+    target IDs instead of tuples of strings. Literals loaded as properties are
+    kept per subject ID as {property: [values]}, and the subjects of rdf:type
+    triples per class label as an `array('I')` of node IDs.
+    
+    With `track_terms` (tables read without rdflib), each edge and literal
+    value also gets its `triple_term_key` until `dedupe` has used them.
+    """
+    
+    def __init__(self, track_terms=False):
+        self.ids = {}
+        self.uris = []
+        self.edges = {}
+        self.rel_types = {}
+        self.literals = {}
+        self.literal_props = {}
+        self.labels = {}
+        self.count = 0
+        self.edge_terms = {} if track_terms else None
+        self.literal_terms = {} if track_terms else None
+    
+    def __getstate__(self):
+        # `ids` is just the inverse of `uris`; rebuilt on demand after unpickling
+        state = self.__dict__.copy()
+        state['ids'] = None
+        return state
+    
+    def intern(self, uri):
+        if self.ids is None:
+            self.ids = {u: i for i, u in enumerate(self.uris)}
+        node_id = self.ids.get(uri)
+        if node_id is None:
+            node_id = self.ids[uri] = len(self.uris)
+            self.uris.append(uri)
+        return node_id
+    
+    def add(self, subj_uri, rel_type, obj_uri, term_key=0):
+        columns = self.edges.get(rel_type)
+        if columns is None:
+            columns = self.edges[rel_type] = (array('I'), array('I'))
+        columns[0].append(self.intern(subj_uri))
+        columns[1].append(self.intern(obj_uri))
+        if self.edge_terms is not None:
+            terms = self.edge_terms.get(rel_type)
+            if terms is None:
+                terms = self.edge_terms[rel_type] = array('I')
+            terms.append(term_key)
+        self.rel_types[rel_type] = self.rel_types.get(rel_type, 0) + 1
+        self.count += 1
+    
+    def add_label(self, subj_uri, label):
+        if label == 'Resource':
+            return
+        members = self.labels.get(label)
+        if members is None:
+            members = self.labels[label] = array('I')
+        members.append(self.intern(subj_uri))
+    
+    def add_literal(self, subj_uri, prop, value, term_key=0):
+        node_id = self.intern(subj_uri)
+        props = self.literals.setdefault(node_id, {})
+        props.setdefault(prop, []).append(value)
+        if self.literal_terms is not None:
+            self.literal_terms.setdefault(node_id, {}).setdefault(prop, []).append(term_key)
+        self.literal_props[prop] = self.literal_props.get(prop, 0) + 1
+        self.count += 1
+    
+    def merge(self, other):
+        """Append another table (e.g. a later file chunk), re-mapping its IDs"""
+        remap = array('I', map(self.intern, other.uris))
+        for rel_type, (src, dst) in other.edges.items():
+            columns = self.edges.get(rel_type)
+            if columns is None:
+                columns = self.edges[rel_type] = (array('I'), array('I'))
+            columns[0].extend(remap[i] for i in src)
+            columns[1].extend(remap[i] for i in dst)
+            self.rel_types[rel_type] = self.rel_types.get(rel_type, 0) + len(src)
+        for node_id, props in other.literals.items():
+            mine = self.literals.setdefault(remap[node_id], {})
+            for prop, values in props.items():
+                mine.setdefault(prop, []).extend(values)
+        for prop, values_count in other.literal_props.items():
+            self.literal_props[prop] = self.literal_props.get(prop, 0) + values_count
+        for label, members in other.labels.items():
+            mine = self.labels.get(label)
+            if mine is None:
+                mine = self.labels[label] = array('I')
+            mine.extend(remap[i] for i in members)
+        if self.edge_terms is not None and other.edge_terms is not None:
+            for rel_type, keys in other.edge_terms.items():
+                self.edge_terms.setdefault(rel_type, array('I')).extend(keys)
+            for node_id, props in other.literal_terms.items():
+                mine = self.literal_terms.setdefault(remap[node_id], {})
+                for prop, keys in props.items():
+                    mine.setdefault(prop, []).extend(keys)
+        self.count += other.count
+    
+    def dedupe(self):
+        """
+        Drop repeated triples, keeping the first of each (as an rdflib Graph does)
+        
+        Triples are compared on their normalized form plus their term keys,
+        so different predicates with the same local name, or a literal and
+        an IRI with the same text, stay separate. The term keys are released
+        afterwards.
+        
+        Returns:
+            number of triples dropped
+        """
+        before = self.count
+        edge_terms = self.edge_terms or {}
+        literal_terms = self.literal_terms or {}
+        for rel_type, (src, dst) in self.edges.items():
+            seen = set()
+            keep_src, keep_dst = array('I'), array('I')
+            terms = edge_terms.get(rel_type) or repeat(0)
+            for s, d, term in zip(src, dst, terms):
+                key = (s << 32 | d) << 32 | term
+                if key not in seen:
+                    seen.add(key)
+                    keep_src.append(s)
+                    keep_dst.append(d)
+            if len(keep_src) < len(src):
+                self.edges[rel_type] = (keep_src, keep_dst)
+                self.count -= len(src) - len(keep_src)
+                self.rel_types[rel_type] = len(keep_src)
+        for node_id, props in self.literals.items():
+            term_props = literal_terms.get(node_id, {})
+            for prop, values in props.items():
+                unique = [value for value, _ in dict.fromkeys(zip(values, term_props.get(prop) or repeat(0)))]
+                if len(unique) < len(values):
+                    props[prop] = unique
+                    self.count -= len(values) - len(unique)
+                    self.literal_props[prop] -= len(values) - len(unique)
+        for label, members in self.labels.items():
+            self.labels[label] = array('I', dict.fromkeys(members))
+        self.edge_terms = self.literal_terms = None
+        return before - self.count
+    
+    def release_lookup(self):
+        """Drop the URI -> ID dict once processing is done (writes only need `uris`)"""
+        self.ids = None
+    
+    def multi_valued_props(self):
+        """Properties that have more than one value on some subject (stored as lists)"""
+        return {prop for props in self.literals.values() for prop, values in props.items() if len(values) > 1}
+    
+    def node_properties(self, node_id, multi_valued):
+        """Property map for one node: lists for `multi_valued` properties, scalars otherwise"""
+        props = self.literals.get(node_id)
+        if not props:
+            return {}
+        return {prop: values if prop in multi_valued else values[0] for prop, values in props.items()}
+    
+    def label_counts(self):
+        return {label: len(members) for label, members in self.labels.items()}
+    
+    @property
+    def edge_count(self):
+        return sum(len(src) for src, _ in self.edges.values())
+    
+    def edge_buffer_bytes(self):
+        return sum(len(src) * src.itemsize + len(dst) * dst.itemsize for src, dst in self.edges.values())
+
+def process_ntriples_range(rdf_file_path, start, end, predicates=None, literal_properties=False):
+    """
+    Parse and normalize the N-Triples lines in bytes [start, end) of a file
+
+    `start` must be at the beginning of a line. Used by the process pool in
+    `process_ntriples_parallel`, but also the serial reference for it.
+
+    Returns:
+        TripleTable
+    """
+    table = TripleTable(track_terms=True)
+    
+    with open(rdf_file_path, 'rb') as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            raw = f.readline()
+            if not raw:
+                break
+            pos += len(raw)
+            try:
+                triple = parse_ntriples_line(raw.decode('utf-8'))
+            except ValueError as e:
+                raise ValueError(f"{rdf_file_path} (byte {pos - len(raw)}): {e}") from None
+            if triple is None:
+                continue
+            add_triple(table, *triple, predicates, literal_properties)
+    
+    return table
+
+def _process_range_task(task):
+    """Process-pool entry point for `process_ntriples_range`"""
+    rdf_file_path, start, end, table, literal_properties = task
+    predicates = PredicateCache(table)
+    return process_ntriples_range(rdf_file_path, start, end, predicates, literal_properties), predicates
+
+def process_ntriples_parallel(rdf_file_path, workers, predicates=None, literal_properties=False):
+    """
+    Parse and normalize an N-Triples/N-Quads file in a pool of `workers` processes
+
+    The file is cut into line-aligned byte ranges (a few per worker so slow
+    chunks even out). Chunk tables are merged in file order, so node IDs and
+    edge columns are identical to `process_ntriples_range` over the whole
+    file. Each worker gets a copy of the pinned table of `predicates` and its
+    cache counters are folded back in.
+
+    Returns:
+        TripleTable
+    """
+    ranges = split_line_ranges(rdf_file_path, workers * 4)
+    table = TripleTable(track_terms=True)
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pinned = predicates.table if predicates is not None else None
+        tasks = [(rdf_file_path, start, end, pinned, literal_properties) for start, end in ranges]
+        for chunk, chunk_cache in pool.map(_process_range_task, tasks):
+            if predicates is not None:
+                predicates.absorb(chunk_cache)
+            table.merge(chunk)
+    
+    return table
+
+def iter_turtle(rdf_file_path, chunk_lines=TURTLE_CHUNK_LINES):
+    """
+    Yield triples from a Turtle file a few thousand statements at a time
+
+    Lines are collected until a statement ends with '.' and the chunk is big
+    enough, then only that chunk (plus the prefix and base declarations) is
+    parsed. A chunk that does not parse on its own is extended to the next
+    boundary, up to TURTLE_MAX_CHUNK_FACTOR times `chunk_lines`. Relative IRIs
+    resolve against the file, and labelled blank nodes (`_:b1`) map to the
+    same node in every chunk, as in a whole-file parse. The lines before a
+    directive are parsed before it takes effect, and a redefined prefix
+    replaces the earlier one, so each statement sees the bindings in force
+    where it appears.
+    """
+    directives = {}
+    buf = []
+    in_long_string = False
+    base_uri = pathlib.Path(os.path.abspath(rdf_file_path)).as_uri()
+    bnodes = {}
+    max_lines = chunk_lines * TURTLE_MAX_CHUNK_FACTOR
+    
+    def parse(lines):
+        chunk = Graph()
+        # rdflib's Turtle parser, minus the per-document blank node labels
+        parser = SinkParser(RDFSink(chunk), baseURI=base_uri, turtle=True)
+        parser._anonymousNodes = bnodes
+        parser.loadBuf(''.join(list(directives.values()) + lines))
+        return chunk
+    
+    with open_rdf(rdf_file_path) as f:
+        for line in f:
+            stripped = line.strip()
+            if not in_long_string and _TURTLE_DIRECTIVE.match(stripped):
+                if buf:
+                    try:
+                        chunk = parse(buf)
+                    except Exception as e:
+                        raise ValueError(f"{rdf_file_path}: cannot parse the statements before {stripped!r}: {e}")
+                    buf = []
+                    yield from chunk
+                # Prefixes are keyed by name; every base is kept, in order, since
+                # a relative base resolves against the one before it
+                prefix = _TURTLE_PREFIX_NAME.match(stripped)
+                key = prefix.group(1) if prefix else len(directives)
+                directives.pop(key, None)
+                directives[key] = line
+                continue
+            buf.append(line)
+            if line.count('"""') % 2:
+                in_long_string = not in_long_string
+            if in_long_string or len(buf) < chunk_lines or not stripped.endswith('.'):
+                continue
+            try:
+                chunk = parse(buf)
+            except Exception as e:
+                if len(buf) >= max_lines:
+                    raise ValueError(f"{rdf_file_path}: no parseable chunk within {len(buf):,} lines: {e}")
+                continue  # statement boundary was a false positive; keep reading
+            buf = []
+            yield from chunk
+    
+    if buf:
+        try:
+            chunk = parse(buf)
+        except Exception as e:
+            raise ValueError(f"{rdf_file_path}: cannot parse the last {len(buf):,} lines: {e}")
+        yield from chunk
+
+def iter_triples(rdf_file_path, sample_size=None):
+    """
+    Stream triples from an N-Triples, N-Quads or Turtle file (optionally gzip/bz2)
+
+    Stops reading as soon as `sample_size` triples have been produced.
+    """
+    fmt, _ = detect_rdf_format(rdf_file_path)
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Streaming mode does not support {fmt} files ({os.path.basename(rdf_file_path)})")
+    triples = iter_turtle(rdf_file_path) if fmt == 'turtle' else iter_ntriples(rdf_file_path)
+    
+    for count, triple in enumerate(triples):
+        if sample_size and count >= sample_size:
+            return
+        yield triple
+
+def iter_chunks(items, size):
+    """Group an iterable into lists of at most `size` items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def edge_batch_query(rel_type):
+    """Build the UNWIND query that creates one batch of `rel_type` edges between node IDs"""
+    return (
+        "UNWIND $rows AS r "
+        "MATCH (s:Resource {id: r[0]}) "
+        "MATCH (t:Resource {id: r[1]}) "
+        f"CREATE (s)-[:{rel_type}]->(t)"
+    )
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def edge_merge_query(rel_type):
+    """Like `edge_batch_query`, but MERGEs the endpoint nodes (streaming mode)"""
+    return (
+        "UNWIND $rows AS r "
+        "MERGE (s:Resource {uri: r[0]}) "
+        "MERGE (t:Resource {uri: r[1]}) "
+        f"CREATE (s)-[:{rel_type}]->(t)"
+    )
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def edge_uri_query(rel_type):
+    """Like `edge_batch_query`, but matches existing endpoints by `uri` (release sync)"""
+    return (
+        "UNWIND $rows AS r "
+        "MATCH (s:Resource {uri: r[0]}) "
+        "MATCH (t:Resource {uri: r[1]}) "
+        f"CREATE (s)-[:{rel_type}]->(t)"
+    )
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def edge_delete_query(rel_type):
+    """Build the UNWIND query that deletes `rel_type` edges between the given URIs"""
+    return (
+        "UNWIND $rows AS r "
+        f"MATCH (s:Resource {{uri: r[0]}})-[e:{rel_type}]->(t:Resource {{uri: r[1]}}) "
+        "DELETE e"
+    )
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def edge_exists_query(rel_type):
+    """Build the UNWIND query that returns which of the given URI pairs have a `rel_type` edge"""
+    return (
+        "UNWIND $rows AS r "
+        "MATCH (s:Resource {uri: r[0]}) "
+        "MATCH (t:Resource {uri: r[1]}) "
+        f"MATCH (s)-[:{rel_type}]->(t) "
+        "RETURN DISTINCT r[0], r[1]"
+    )
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def label_batch_query(label):
+    """Build the UNWIND query that adds `label` to a batch of nodes given by `id`"""
+    return f"UNWIND $rows AS id MATCH (n:Resource {{id: id}}) SET n:{label}"
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def label_uri_query(label):
+    """Like `label_batch_query`, but matches nodes by `uri` (release sync)"""
+    return f"UNWIND $rows AS u MATCH (n:Resource {{uri: u}}) SET n:{label}"
+
+@lru_cache(maxsize=PREDICATE_CACHE_SIZE)
+def label_remove_query(label):
+    """Build the UNWIND query that removes `label` from the nodes with the given URIs"""
+    return f"UNWIND $rows AS u MATCH (n:Resource {{uri: u}}) REMOVE n:{label}"
+
+def query_template_stats():
+    """
+    Hit/miss counters of the per-relationship-type query template caches
+
+    Every batch of a type reuses the identical query text (only `$rows`
+    changes), so the server parses and plans it once and then hits its
+    plan cache.
+    """
+    infos = [builder.cache_info() for builder in
+             (edge_batch_query, edge_merge_query, edge_uri_query, edge_delete_query,
+              edge_exists_query, label_batch_query, label_uri_query, label_remove_query)]
+    return {
+        'templates': sum(info.currsize for info in infos),
+        'hits': sum(info.hits for info in infos),
+        'misses': sum(info.misses for info in infos)
+    }
+
+def classify_failure(exc):
+    """
+    Short category for a failed query, used as the key of the failure stats
+
+    'timeout' and 'connection' are transient and worth a resume, 'out_of_memory'
+    means the server hit its memory limit, 'query' is any other server-side
+    error, and 'client' covers errors raised before the query was sent.
+    """
+    if isinstance(exc, (RedisTimeoutError, TimeoutError)):
+        return 'timeout'
+    if isinstance(exc, (RedisConnectionError, ConnectionError)):
+        return 'connection'
+    if isinstance(exc, ResponseError):
+        return 'out_of_memory' if 'OOM' in str(exc) or 'memory' in str(exc).lower() else 'query'
+    return 'client'
+
+def failed_before_send(exc):
+    """
+    Whether a failed query certainly never reached the server
+    
+    Only these are safe to resend: a timeout or dropped connection while
+    reading the reply may follow a committed write, and resending a CREATE
+    batch would then duplicate its nodes or edges.
+    """
+    return classify_failure(exc) in ('timeout', 'connection') and bool(_CONNECT_FAILURE.search(str(exc)))
+
+def record_failure(failures, exc, rows=0):
+    """Count a failed query in a {category: {batches, rows, example}} dict"""
+    if failures is None:
+        return
+    entry = failures.setdefault(classify_failure(exc), {'batches': 0, 'rows': 0, 'example': None})
+    entry['batches'] += 1
+    entry['rows'] += rows
+    if entry['example'] is None:
+        entry['example'] = f"{type(exc).__name__}: {exc}"[:200]
+
+def _rate(count, seconds):
+    """Rows per second, safe for zero-length phases"""
+    return count / seconds if seconds > 0 else 0.0
+
+def run_batches(graph, batches, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                counters=('nodes_created',), on_batch=None, on_success=None, failures=None,
+                metrics=None, phase=None, retries=0):
+    """
+    Execute an iterable of (query, rows) batches with bounded concurrency
+
+    Up to `max_in_flight` batches are outstanding at once; the next batch is
+    only pulled from `batches` when one of them completes, so a lazy iterable
+    is never read further ahead than that.
+
+    Args:
+        graph: FalkorDB graph handle
+        batches: iterable of (query, rows); each becomes one query with `$rows`
+        max_in_flight: number of concurrent batches (1 = sequential)
+        counters: QueryResult statistics to sum (e.g. 'relationships_created')
+        on_batch: optional callback(totals, rows_done) after each batch
+        on_success: optional callback(seq) once batch number `seq` (0-based,
+                    in submission order) has committed; not called on failure,
+                    and an exception it raises stops the run instead of
+                    counting the batch as failed
+        failures: optional dict that failed batches are recorded in by
+                  category (see `record_failure`)
+        metrics: optional `run_metrics.Metrics` told about every committed,
+                 retried and failed batch, as part of `phase`
+        retries: resubmit a batch up to this many times when the connection
+                 could not be opened (see `failed_before_send`) before
+                 counting it as failed
+
+    Returns:
+        (totals, failed_rows, failed_batches) where totals maps counter -> sum
+    """
+    max_in_flight = max(1, max_in_flight)
+    totals = {name: 0 for name in counters}
+    rows_done = 0
+    failed_rows = 0
+    failed_batches = 0
+    start = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        pending = {}
+        
+        def submit(seq, query, rows, attempt=0):
+            future = pool.submit(graph.query, query, {'rows': rows})
+            pending[future] = (seq, query, rows, attempt, time.perf_counter())
+        
+        def collect(future):
+            nonlocal rows_done, failed_rows, failed_batches
+            seq, query, rows, attempt, submitted = pending.pop(future)
+            size = len(rows)
+            committed = False
+            try:
+                result = future.result()
+                for name in counters:
+                    totals[name] += getattr(result, name, 0) or 0
+                committed = True
+            except Exception as e:
+                category = classify_failure(e)
+                if attempt < retries and failed_before_send(e):
+                    if metrics:
+                        metrics.retry(phase, size, attempt + 1, category, e)
+                    submit(seq, query, rows, attempt + 1)
+                    return
+                failed_rows += size
+                failed_batches += 1
+                record_failure(failures, e, size)
+                if metrics:
+                    metrics.failure(phase, size, category, e)
+            rows_done += size
+            # Outside the try: a committed batch must never be counted as failed
+            # (and resent on resume) because recording it raised
+            if committed and on_success:
+                on_success(seq)
+            if committed and metrics:
+                now = time.perf_counter()
+                metrics.batch_committed(phase, size, rows_done, _rate(rows_done, now - start), now - submitted)
+            if on_batch:
+                on_batch(totals, rows_done)
+        
+        for seq, (query, rows) in enumerate(batches):
+            while len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+            submit(seq, query, rows)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+    
+    return totals, failed_rows, failed_batches
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's contents, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def default_checkpoint_path(rdf_file_path, graph_name):
+    """
+    Checkpoint file of a load: next to the input file, or under the temp
+    directory when the input's directory is read-only
+    """
+    path = f"{rdf_file_path}.{graph_name}.checkpoint.json"
+    if os.path.exists(path) or os.access(os.path.dirname(os.path.abspath(path)), os.W_OK):
+        return path
+    source = hashlib.sha1(os.path.abspath(rdf_file_path).encode('utf-8')).hexdigest()[:12]
+    fallback_dir = os.path.join(tempfile.gettempdir(), 'rdf-checkpoints')
+    os.makedirs(fallback_dir, exist_ok=True)
+    return os.path.join(fallback_dir, f"{source}-{os.path.basename(path)}")
+
+class LoadCheckpoint:
+    """
+    Record of which write batches have committed, for resuming a load
+
+    Progress is kept per phase ('nodes', 'edges:<type>') as the row offset up
+    to which every batch has committed, plus the start offsets of batches that
+    committed out of order beyond it (several batches are in flight at once).
+    The file is rewritten atomically after every committed batch.
+    """
+    
+    def __init__(self, path, state):
+        self.path = path
+        self.state = state
+    
+    @classmethod
+    def start(cls, path, file_hash, graph_name, batch_size, sample_size, table):
+        state = {
+            'file_sha256': file_hash,
+            'graph_name': graph_name,
+            'batch_size': batch_size,
+            'sample_size': sample_size,
+            'node_count': len(table.uris),
+            'rel_types': table.rel_types,
+            'literal_props': table.literal_props,
+            'labels': table.label_counts(),
+            'indexes_created': False,
+            'phases': {}
+        }
+        checkpoint = cls(path, state)
+        checkpoint.save()
+        return checkpoint
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(path, json.load(f))
+    
+    def mismatch(self, file_hash, graph_name, sample_size, table):
+        """Why this checkpoint cannot be resumed for the given load, or None"""
+        state = self.state
+        if state['file_sha256'] != file_hash:
+            return 'input file has changed since the checkpoint was written'
+        if state['graph_name'] != graph_name:
+            return f"checkpoint is for graph '{state['graph_name']}'"
+        if state['sample_size'] != sample_size:
+            return f"checkpoint was written with sample_size={state['sample_size']}"
+        if state['node_count'] != len(table.uris) or state['rel_types'] != table.rel_types or \
+                state.get('literal_props', {}) != table.literal_props or \
+                state.get('labels', {}) != table.label_counts():
+            return 'processed triples differ from the checkpointed load'
+        return None
+    
+    def is_done(self, phase, start):
+        progress = self.state['phases'].get(phase)
+        if progress is None:
+            return False
+        return start < progress['offset'] or start in progress['extra']
+    
+    def mark_done(self, phase, start, size):
+        progress = self.state['phases'].setdefault(phase, {'offset': 0, 'extra': []})
+        extra = set(progress['extra'])
+        extra.add(start)
+        # Advance the contiguous offset over batches that are now all committed
+        while progress['offset'] in extra:
+            extra.discard(progress['offset'])
+            progress['offset'] += size
+        progress['extra'] = sorted(extra)
+        self.save()
+    
+    def mark_indexes_created(self):
+        self.state['indexes_created'] = True
+        self.save()
+    
+    def save(self):
+        self.state['updated'] = time.time()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+    
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class MappedStrings:
+    """
+    Read-only list of strings stored back to back as UTF-8 in a mapped file
+    
+    `offsets` holds len + 1 byte offsets. Items are decoded on access, so a
+    cached URI table costs no memory until its nodes are written.
+    """
+    
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('string index out of range')
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+def _map_file(path, typecode=None):
+    """Memory-map a file read-only, as a typed memoryview if `typecode` is given"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return array(typecode) if typecode else b''
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(data).cast(typecode) if typecode else data
+
+class TripleCache:
+    """
+    On-disk cache of processed TripleTables, keyed by input file hash
+    
+    Each entry is a directory named after the file's SHA-256 and a hash of
+    the processing options (sample size, literal mode, pinned relationship
+    types). It holds the interned URIs, the predicate mapping and every edge
+    and label column as raw arrays, which are memory-mapped on load rather
+    than read. Entries are found by the file's path, size and mtime first, so
+    a hit does not even hash the file; a changed mtime falls back to hashing,
+    and changed content misses. Least recently used entries are evicted once
+    the cache grows past `max_bytes`.
+    """
+    
+    def __init__(self, cache_dir, max_bytes=TRIPLE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def variant(sample_size, literal_properties, pinned_types):
+        """Short hash of the options that change the processed table"""
+        key = json.dumps([TRIPLE_CACHE_VERSION, sample_size, literal_properties, sorted(pinned_types.items())])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]
+    
+    def entries(self):
+        """(entry directory, meta) of every complete entry"""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if '.tmp-' in name:
+                continue
+            meta = self._read_meta(os.path.join(self.cache_dir, name))
+            if meta is not None:
+                found.append((os.path.join(self.cache_dir, name), meta))
+        return found
+    
+    def lookup(self, rdf_file_path, variant):
+        """
+        Find the cached table of a file
+        
+        Returns:
+            (table, mapping, file_hash, entry); table, mapping and entry are
+            None on a miss, file_hash is always the file's SHA-256
+        """
+        source = os.path.abspath(rdf_file_path)
+        stat = os.stat(rdf_file_path)
+        file_hash = next((meta['file_sha256'] for _, meta in self.entries()
+                          if (meta['source'], meta['size'], meta['mtime_ns']) ==
+                          (source, stat.st_size, stat.st_mtime_ns)), None)
+        if file_hash is None:
+            file_hash = file_sha256(rdf_file_path)
+        entry = os.path.join(self.cache_dir, f"{file_hash}-{variant}")
+        meta = self._read_meta(entry)
+        if meta is None or meta['byteorder'] != sys.byteorder:
+            return None, None, file_hash, None
+        # Same content under a new path or mtime: record it so the next lookup skips hashing
+        meta.update(source=source, size=stat.st_size, mtime_ns=stat.st_mtime_ns, last_used=time.time())
+        self._write_meta(entry, meta)
+        return self._load(entry, meta), meta['predicates'], file_hash, entry
+    
+    def store(self, rdf_file_path, file_hash, variant, table, mapping):
+        """
+        Save `table` as the entry for this file and variant
+        
+        Older entries for the same path and variant are dropped, then least
+        recently used ones until the cache fits in `max_bytes`.
+        
+        Returns:
+            the entry directory, or None if the table alone exceeds max_bytes
+        """
+        entry = os.path.join(self.cache_dir, f"{file_hash}-{variant}")
+        tmp = f"{entry}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        
+        offsets = array('Q', [0])
+        with open(os.path.join(tmp, 'uris.bin'), 'wb') as f:
+            for uri in table.uris:
+                data = uri.encode('utf-8')
+                f.write(data)
+                offsets.append(offsets[-1] + len(data))
+        self._write_array(tmp, 'uris.off', offsets)
+        edges = []
+        for idx, (rel_type, (src, dst)) in enumerate(table.edges.items()):
+            self._write_array(tmp, f'edges_{idx:04d}.src', src)
+            self._write_array(tmp, f'edges_{idx:04d}.dst', dst)
+            edges.append({'type': rel_type, 'file': f'edges_{idx:04d}', 'count': len(src)})
+        labels = []
+        for idx, (label, members) in enumerate(table.labels.items()):
+            self._write_array(tmp, f'labels_{idx:04d}.ids', members)
+            labels.append({'label': label, 'file': f'labels_{idx:04d}.ids', 'count': len(members)})
+        with open(os.path.join(tmp, 'literals.json'), 'w', encoding='utf-8') as f:
+            json.dump({str(node_id): props for node_id, props in table.literals.items()}, f, ensure_ascii=False)
+        
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+        if size > self.max_bytes:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return None
+        stat = os.stat(rdf_file_path)
+        source = os.path.abspath(rdf_file_path)
+        self._write_meta(tmp, {
+            'version': TRIPLE_CACHE_VERSION,
+            'source': source,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'file_sha256': file_hash,
+            'variant': variant,
+            'byteorder': sys.byteorder,
+            'bytes': size,
+            'count': table.count,
+            'rel_types': table.rel_types,
+            'literal_props': table.literal_props,
+            'edges': edges,
+            'labels': labels,
+            'predicates': mapping,
+            'created': time.time(),
+            'last_used': time.time()
+        })
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        
+        for path, meta in self.entries():
+            if path != entry and meta['source'] == source and meta['variant'] == variant:
+                shutil.rmtree(path, ignore_errors=True)
+        self.evict(keep=entry)
+        return entry
+    
+    def evict(self, keep=None):
+        """Remove least recently used entries until the cache fits in max_bytes; returns their names"""
+        entries = sorted(self.entries(), key=lambda item: item[1]['last_used'])
+        total = sum(meta['bytes'] for _, meta in entries)
+        removed = []
+        for path, meta in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= meta['bytes']
+            removed.append(os.path.basename(path))
+        return removed
+    
+    def _load(self, entry, meta):
+        table = TripleTable()
+        table.ids = None
+        table.uris = MappedStrings(_map_file(os.path.join(entry, 'uris.bin')),
+                                   _map_file(os.path.join(entry, 'uris.off'), 'Q'))
+        for edge in meta['edges']:
+            table.edges[edge['type']] = (_map_file(os.path.join(entry, edge['file'] + '.src'), 'I'),
+                                         _map_file(os.path.join(entry, edge['file'] + '.dst'), 'I'))
+        for label in meta['labels']:
+            table.labels[label['label']] = _map_file(os.path.join(entry, label['file']), 'I')
+        with open(os.path.join(entry, 'literals.json'), 'r', encoding='utf-8') as f:
+            table.literals = {int(node_id): props for node_id, props in json.load(f).items()}
+        table.rel_types = meta['rel_types']
+        table.literal_props = meta['literal_props']
+        table.count = meta['count']
+        return table
+    
+    @staticmethod
+    def _write_array(directory, name, values):
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(memoryview(values).cast('B'))
+    
+    @staticmethod
+    def _read_meta(entry):
+        try:
+            with open(os.path.join(entry, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('version') == TRIPLE_CACHE_VERSION else None
+    
+    @staticmethod
+    def _write_meta(entry, meta):
+        # Per writer, so loads sharing an entry can record their lookups at once
+        tmp_path = os.path.join(entry, f'meta.json.tmp-{os.getpid()}-{threading.get_ident()}')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(entry, 'meta.json'))
+
+def _checkpointed_batches(phase, total, batch_size, make_batch, checkpoint):
+    """
+    Yield the (query, rows) batches of a phase that the checkpoint has not seen
+
+    Returns:
+        (batches, on_success, skipped) for `run_batches`; `skipped()` gives the
+        number of rows left out because they had already committed
+    """
+    starts = []
+    skipped = 0
+    
+    def batches():
+        nonlocal skipped
+        for i in range(0, total, batch_size):
+            if checkpoint is not None and checkpoint.is_done(phase, i):
+                skipped += min(batch_size, total - i)
+                continue
+            starts.append(i)
+            yield make_batch(i)
+    
+    def on_success(seq):
+        if checkpoint is not None:
+            checkpoint.mark_done(phase, starts[seq], batch_size)
+    
+    return batches(), on_success, lambda: skipped
+
+def write_nodes(graph, table, batch_size=DEFAULT_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                checkpoint=None, failures=None, metrics=None, retries=0):
+    """
+    Create one :Resource {id, uri} node per interned URI
+
+    Literal properties collected for a node are set in the same CREATE, so
+    they cost no extra query. Batches already recorded in `checkpoint` are
+    skipped; new ones are recorded as they commit.
+
+    Returns:
+        (nodes_created, failed_rows, skipped_rows)
+    """
+    total = len(table.uris)
+    start = time.time()
+    next_report = batch_size * 5
+    
+    if table.literals:
+        multi_valued = table.multi_valued_props()
+        
+        def make_batch(i):
+            return NODE_PROPS_BATCH_QUERY, [
+                [node_id, uri, table.node_properties(node_id, multi_valued)]
+                for node_id, uri in enumerate(table.uris[i:i + batch_size], i)
+            ]
+    else:
+        def make_batch(i):
+            return NODE_BATCH_QUERY, [[node_id, uri] for node_id, uri in enumerate(table.uris[i:i + batch_size], i)]
+    
+    batches, on_success, skipped = _checkpointed_batches('nodes', total, batch_size, make_batch, checkpoint)
+    
+    def progress(totals, done):
+        nonlocal next_report
+        if done >= next_report or done == total:
+            next_report += batch_size * 5
+            print(f"  Loaded {done:,}/{total:,} ({_rate(done, time.time() - start):.0f}/sec)")
+    
+    totals, failed_rows, _ = run_batches(
+        graph, batches, max_in_flight, ('nodes_created',), progress, on_success, failures,
+        metrics, 'nodes', retries
+    )
+    return totals['nodes_created'], failed_rows, skipped()
+
+def create_index(graph, prop, failures=None, label='Resource'):
+    """Create the :`label`(`prop`) index; returns False if it could not be created"""
+    try:
+        graph.query(f"CREATE INDEX ON :{label}({prop})")
+        print(f"✅ Index on :{label}({prop}) created")
+    except Exception as e:
+        if 'already indexed' in str(e).lower() or 'already exists' in str(e).lower():
+            print(f"⚠️  Index on :{label}({prop}) already exists")
+        else:
+            record_failure(failures, e)
+            print(f"❌ Index on :{label}({prop}) not created: {e}")
+            return False
+    return True
+
+def wait_for_index(graph, label, prop, timeout=INDEX_BUILD_TIMEOUT, poll=INDEX_POLL_SECONDS):
+    """
+    Block until the :`label`(`prop`) index reports OPERATIONAL
+
+    FalkorDB builds an index over existing nodes in the background; queries
+    that run meanwhile fall back to label scans. Returns the final status,
+    or None if the server does not report index status.
+    """
+    deadline = time.time() + timeout
+    while True:
+        try:
+            rows = graph.ro_query(
+                "CALL db.indexes() YIELD label, properties, status RETURN label, properties, status"
+            ).result_set
+        except Exception:
+            return None
+        status = next((row[2] for row in rows if row[0] == label and prop in row[1]), None)
+        if status is None or status == 'OPERATIONAL' or time.time() >= deadline:
+            return status
+        time.sleep(poll)
+
+def plan_indexes(table=None, extra_properties=(), type_labels=True):
+    """
+    Decide which indexes to create and at which point of the load
+
+    Table loads defer :Resource(id) and :Resource(uri) until after the bulk
+    node insert (one build is cheaper than maintaining them per insert), but
+    before edge matching and label assignment, which match on `id`. Labels
+    derived from rdf:type with at least LABEL_INDEX_MIN_NODES members get a
+    uri index once they are assigned. Without a table (streaming and
+    pipeline modes), :Resource(uri) is needed before the first MERGE.
+
+    Returns:
+        list of {'stage', 'label', 'property'} steps in creation order
+    """
+    if table is None:
+        return [{'stage': 'before_writes', 'label': 'Resource', 'property': 'uri'}]
+    steps = [{'stage': 'after_nodes', 'label': 'Resource', 'property': prop}
+             for prop in NODE_INDEXES + tuple(p for p in extra_properties if p not in NODE_INDEXES)]
+    for label, count in sorted(table.label_counts().items()):
+        if type_labels and count >= LABEL_INDEX_MIN_NODES:
+            steps.append({'stage': 'after_labels', 'label': label, 'property': 'uri'})
+    return steps
+
+def apply_index_plan(graph, steps, stage, failures=None):
+    """
+    Create the indexes of one plan stage and wait until each is built
+
+    Returns:
+        list of step dicts with status, create_seconds and build_seconds
+    """
+    report = []
+    for step in steps:
+        if step['stage'] != stage:
+            continue
+        start = time.time()
+        created = create_index(graph, step['property'], failures, step['label'])
+        create_seconds = time.time() - start
+        status = wait_for_index(graph, step['label'], step['property']) if created else 'FAILED'
+        build_seconds = time.time() - start - create_seconds
+        if status not in (None, 'OPERATIONAL', 'FAILED'):
+            print(f"⚠️  Index on :{step['label']}({step['property']}) still {status} after {build_seconds:.0f}s")
+        report.append(dict(step, status=status, create_seconds=create_seconds, build_seconds=build_seconds))
+    return report
+
+def create_node_indexes(graph, failures=None):
+    """Index :Resource on `id` (edge matching) and `uri` (lookups); returns seconds spent"""
+    start = time.time()
+    steps = [{'stage': 'after_nodes', 'label': 'Resource', 'property': prop} for prop in NODE_INDEXES]
+    apply_index_plan(graph, steps, 'after_nodes', failures)
+    return time.time() - start
+
+def write_labels(graph, table, batch_size=DEFAULT_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 checkpoint=None, failures=None, metrics=None, retries=0):
+    """
+    Add the rdf:type-derived labels to their :Resource nodes, one batch per label
+
+    Nodes are matched by `id`, so the :Resource(id) index must be built.
+
+    Returns:
+        (labels_added, failed_rows, skipped_rows)
+    """
+    added = 0
+    failed_rows = 0
+    skipped_rows = 0
+    for label, members in table.labels.items():
+        query = label_batch_query(label)
+        
+        def make_batch(i, query=query, members=members):
+            return query, members[i:i + batch_size].tolist()
+        
+        batches, on_success, skipped = _checkpointed_batches(
+            f'labels:{label}', len(members), batch_size, make_batch, checkpoint
+        )
+        totals, failed, _ = run_batches(
+            graph, batches, max_in_flight, ('labels_added',), None, on_success, failures,
+            metrics, 'labels', retries
+        )
+        print(f"  :{label}: {len(members):,} nodes")
+        added += totals['labels_added']
+        failed_rows += failed
+        skipped_rows += skipped()
+    return added, failed_rows, skipped_rows
+
+def write_edges(graph, table, batch_size=DEFAULT_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                checkpoint=None, failures=None, metrics=None, retries=0):
+    """
+    Create all edges of a TripleTable, one UNWIND query per batch and type
+
+    Endpoints are matched by their integer `id`, so `create_node_indexes`
+    must have run first. Batches already recorded in `checkpoint` are skipped.
+
+    Returns:
+        (relationships_created, failed_rows, failed_batches, skipped_rows)
+    """
+    total_edges = table.edge_count
+    start = time.time()
+    created_total = 0
+    failed_rows = 0
+    failed_batches = 0
+    skipped_rows = 0
+    
+    for rel_idx, (rel_type, (src, dst)) in enumerate(table.edges.items()):
+        if rel_idx % 10 == 0 or rel_idx == len(table.edges) - 1:
+            print(f"  [{rel_idx+1}/{len(table.edges)}] '{rel_type}': {len(src):,}")
+        
+        query = edge_batch_query(rel_type)
+        created_before = created_total
+        next_report = batch_size * 10
+        
+        def make_batch(i, query=query, src=src, dst=dst):
+            return query, [list(pair) for pair in zip(src[i:i + batch_size], dst[i:i + batch_size])]
+        
+        batches, on_success, skipped = _checkpointed_batches(
+            f'edges:{rel_type}', len(src), batch_size, make_batch, checkpoint
+        )
+        
+        def progress(totals, done):
+            nonlocal next_report
+            if done >= next_report:
+                next_report += batch_size * 10
+                so_far = created_before + totals['relationships_created']
+                rate = _rate(so_far, time.time() - start)
+                print(f"    Progress: {so_far:,}/{total_edges:,} ({rate:.0f}/sec)")
+        
+        totals, failed, batch_failures = run_batches(
+            graph, batches, max_in_flight, ('relationships_created',), progress, on_success, failures,
+            metrics, 'relationships', retries
+        )
+        created_total += totals['relationships_created']
+        failed_rows += failed
+        failed_batches += batch_failures
+        skipped_rows += skipped()
+    
+    return created_total, failed_rows, failed_batches, skipped_rows
+
+def sample_triples(table, sample_size=VERIFY_SAMPLE_SIZE, seed=None):
+    """
+    Uniform random sample of the edges of a TripleTable
+    
+    Returns:
+        list of (relationship_type, subject_uri, object_uri)
+    """
+    picks = sorted(random.Random(seed).sample(range(table.edge_count), min(sample_size, table.edge_count)))
+    sample = []
+    offset = 0
+    pick = 0
+    for rel_type in sorted(table.edges):
+        src, dst = table.edges[rel_type]
+        end = offset + len(src)
+        while pick < len(picks) and picks[pick] < end:
+            row = picks[pick] - offset
+            sample.append((rel_type, table.uris[src[row]], table.uris[dst[row]]))
+            pick += 1
+        offset = end
+    return sample
+
+def verify_graph(graph, rel_types, node_count=None, label_counts=None, sample=(),
+                 batch_size=VERIFY_BATCH_SIZE):
+    """
+    Check a loaded graph against the source-side tallies of its load
+    
+    Every count is one query the server answers from its label and relation
+    matrices, without scanning nodes: :Resource nodes, edges of each
+    relationship type and members of each label. Types and labels the graph
+    has but the source does not are counted too. The `sample` triples are
+    then looked up by indexed `uri` matches, one UNWIND query per type and
+    batch. Literals stored as properties are not checked.
+    
+    Args:
+        graph: FalkorDB graph
+        rel_types: {relationship type: expected edges} (e.g. `TripleTable.rel_types`)
+        node_count: expected :Resource nodes (None to skip)
+        label_counts: {label: expected nodes} (None to skip)
+        sample: (relationship_type, subject_uri, object_uri) triples to look up
+        batch_size: sample triples per query
+    
+    Returns:
+        dict with ok, the mismatched counts, the sample triples not found and
+        seconds; or {'error': ...} if a query failed
+    """
+    start = time.time()
+    
+    def count(query):
+        return graph.ro_query(query).result_set[0][0]
+    
+    try:
+        nodes = None
+        if node_count is not None:
+            nodes = {'expected': node_count, 'found': count("MATCH (n:Resource) RETURN count(n)")}
+        
+        graph_types = [row[0] for row in graph.ro_query("CALL db.relationshipTypes()").result_set]
+        mismatched_types = {}
+        for rel_type in sorted(set(rel_types) | set(graph_types)):
+            expected = rel_types.get(rel_type, 0)
+            found = count(f"MATCH ()-[r:`{rel_type}`]->() RETURN count(r)")
+            if found != expected:
+                mismatched_types[rel_type] = {'expected': expected, 'found': found}
+        
+        mismatched_labels = {}
+        labels = set()
+        if label_counts is not None:
+            graph_labels = [row[0] for row in graph.ro_query("CALL db.labels()").result_set]
+            labels = (set(label_counts) | set(graph_labels)) - {'Resource'}
+            for label in sorted(labels):
+                expected = label_counts.get(label, 0)
+                found = count(f"MATCH (n:`{label}`) RETURN count(n)")
+                if found != expected:
+                    mismatched_labels[label] = {'expected': expected, 'found': found}
+        
+        by_type = {}
+        for rel_type, subj_uri, obj_uri in sample:
+            by_type.setdefault(rel_type, []).append([subj_uri, obj_uri])
+        missing = []
+        for rel_type, rows in by_type.items():
+            for chunk in iter_chunks(rows, batch_size):
+                found = {tuple(row) for row in graph.ro_query(edge_exists_query(rel_type), {'rows': chunk}).result_set}
+                missing.extend((rel_type, subj_uri, obj_uri) for subj_uri, obj_uri in chunk
+                               if (subj_uri, obj_uri) not in found)
+    except Exception as e:
+        return {'error': f'Verification query failed: {type(e).__name__}: {e}'}
+    
+    return {
+        'ok': not (nodes and nodes['expected'] != nodes['found']) and not mismatched_types
+              and not mismatched_labels and not missing,
+        'nodes': nodes,
+        'relationship_types_checked': len(set(rel_types) | set(graph_types)),
+        'mismatched_relationship_types': mismatched_types,
+        'labels_checked': len(labels),
+        'mismatched_labels': mismatched_labels,
+        'sample_checked': len(sample),
+        'sample_missing': len(missing),
+        'missing_examples': missing[:10],
+        'seconds': time.time() - start
+    }
+
+def verify_table_load(graph, table, sample_size=VERIFY_SAMPLE_SIZE, type_labels=True, seed=None):
+    """`verify_graph` with the tallies and a random edge sample of the TripleTable that was loaded"""
+    label_counts = {label: len(set(members)) for label, members in table.labels.items()} if type_labels else None
+    return verify_graph(graph, table.rel_types, len(table.uris), label_counts,
+                        sample_triples(table, sample_size, seed))
+
+def print_verification(report):
+    """Print the outcome of `verify_graph`"""
+    if 'error' in report:
+        print(f"❌ {report['error']}")
+        return
+    print(f"{'✅' if report['ok'] else '❌'} Verification {'passed' if report['ok'] else 'FAILED'} "
+          f"in {report['seconds']:.1f}s")
+    if report['nodes']:
+        print(f"  • Nodes: {report['nodes']['found']:,} of {report['nodes']['expected']:,}")
+    print(f"  • Relationship types: {report['relationship_types_checked'] - len(report['mismatched_relationship_types'])}"
+          f"/{report['relationship_types_checked']} counts match")
+    for rel_type, counts in report['mismatched_relationship_types'].items():
+        print(f"    - {rel_type}: {counts['found']:,} edges, expected {counts['expected']:,}")
+    if report['labels_checked']:
+        print(f"  • Labels: {len(report['mismatched_labels'])} mismatched of {report['labels_checked']}")
+    for label, counts in report['mismatched_labels'].items():
+        print(f"    - :{label}: {counts['found']:,} nodes, expected {counts['expected']:,}")
+    print(f"  • Sampled triples: {report['sample_checked'] - report['sample_missing']:,}"
+          f"/{report['sample_checked']:,} found")
+    for rel_type, subj_uri, obj_uri in report['missing_examples']:
+        print(f"    - missing: {subj_uri} -[{rel_type}]-> {obj_uri}")
+
+def group_chunk(chunk, predicates=None):
+    """Normalize a list of raw triples into {relationship type: [[subject_uri, object_uri], ...]}"""
+    by_type = {}
+    for subj, pred, obj in chunk:
+        subj_uri, rel_type, obj_uri = normalize_triple(subj, pred, obj, predicates)
+        by_type.setdefault(rel_type, []).append((subj_uri, obj_uri))
+    return by_type
+
+def stream_load(graph, triples, batch_size=DEFAULT_BATCH_SIZE,
+                max_in_flight=DEFAULT_MAX_IN_FLIGHT, predicates=None, failures=None,
+                metrics=None, retries=0):
+    """
+    Write a triple stream to FalkorDB without holding it in memory
+
+    Each chunk of `batch_size` triples is grouped by relationship type and
+    sent as one MERGE-endpoints/CREATE-edge query per type, so the client
+    only ever holds `max_in_flight` chunks.
+
+    Returns:
+        dict with triples, nodes, relationships and failure counts
+    """
+    rel_types = {}
+    triples_read = 0
+    
+    def batches():
+        nonlocal triples_read
+        for chunk in iter_chunks(triples, batch_size):
+            by_type = group_chunk(chunk, predicates)
+            triples_read += len(chunk)
+            for rel_type, rows in by_type.items():
+                rel_types[rel_type] = rel_types.get(rel_type, 0) + len(rows)
+                yield edge_merge_query(rel_type), rows
+    
+    start = time.time()
+    next_report = batch_size * 10
+    
+    def progress(totals, done):
+        nonlocal next_report
+        if done >= next_report:
+            next_report += batch_size * 10
+            print(f"  Streamed {done:,} triples ({_rate(done, time.time() - start):.0f}/sec)")
+    
+    totals, failed_rows, failed_batches = run_batches(
+        graph, batches(), max_in_flight,
+        ('nodes_created', 'relationships_created'), progress, failures=failures,
+        metrics=metrics, phase='stream', retries=retries
+    )
+    return {
+        'triples': triples_read,
+        'nodes_created': totals['nodes_created'],
+        'relationships_created': totals['relationships_created'],
+        'rel_types': rel_types,
+        'failed_relationships': failed_rows,
+        'failed_batches': failed_batches
+    }
+
+def export_bulk_csv(table, out_dir, type_labels=True):
+    """
+    Write a TripleTable as CSV files for the FalkorDB bulk loader
+    
+    One node file (`Resource.csv`, columns id and uri) and one file per
+    relationship type (source and target node IDs), with typed headers for
+    `falkordb-bulk-insert --enforce-schema --id-type INTEGER`. With
+    `type_labels`, each rdf:type label also gets a file of node IDs; the bulk
+    loader gives a node a single label, so `replay_bulk_csv` adds these after
+    the insert. A manifest records each file's type or label and row count.
+    
+    Returns:
+        manifest dict (also saved as manifest.json in `out_dir`)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    
+    with open(os.path.join(out_dir, BULK_NODE_FILE), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, **BULK_CSV_FORMAT)
+        writer.writerow(BULK_NODE_HEADER)
+        writer.writerows(enumerate(table.uris))
+    
+    relations = []
+    for rel_idx, (rel_type, (src, dst)) in enumerate(table.edges.items()):
+        # Types are passed explicitly, so file names only need to be unique
+        file_name = f"rel_{rel_idx:04d}_{rel_type}.csv"
+        with open(os.path.join(out_dir, file_name), 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, **BULK_CSV_FORMAT)
+            writer.writerow(BULK_EDGE_HEADER)
+            writer.writerows(zip(src, dst))
+        relations.append({'type': rel_type, 'file': file_name, 'count': len(src)})
+    
+    labels = []
+    for label_idx, (label, members) in enumerate(table.labels.items() if type_labels else ()):
+        file_name = f"label_{label_idx:04d}_{label}.csv"
+        members = list(dict.fromkeys(members))
+        with open(os.path.join(out_dir, file_name), 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, **BULK_CSV_FORMAT)
+            writer.writerow(BULK_LABEL_HEADER)
+            writer.writerows([node_id] for node_id in members)
+        labels.append({'label': label, 'file': file_name, 'count': len(members)})
+    
+    manifest = {
+        'nodes': {'label': 'Resource', 'file': BULK_NODE_FILE, 'count': len(table.uris)},
+        'relations': relations,
+        'labels': labels
+    }
+    with open(os.path.join(out_dir, BULK_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def bulk_insert_command(csv_dir, manifest, graph_name, host='localhost', port=6379):
+    """Build the `falkordb-bulk-insert` command line for an exported CSV directory"""
+    cmd = [BULK_INSERT_TOOL, graph_name, '--server-url', f"redis://{host}:{port}",
+           '--enforce-schema', '--id-type', 'INTEGER',
+           '-N', manifest['nodes']['label'], os.path.join(csv_dir, manifest['nodes']['file'])]
+    for rel in manifest['relations']:
+        cmd += ['-R', rel['type'], os.path.join(csv_dir, rel['file'])]
+    for prop in NODE_INDEXES:
+        cmd += ['-i', f"Resource:{prop}"]
+    return cmd
+
+def iter_bulk_csv_rows(path):
+    """Yield the data rows of an exported CSV as [int, ...] lists (quoted values stay strings)"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, quoting=csv.QUOTE_NONNUMERIC, escapechar='\\', doublequote=False)
+        next(reader, None)
+        for row in reader:
+            yield [int(value) if isinstance(value, float) else value for value in row]
+
+def replay_bulk_csv(csv_dir, graph_name, host='localhost', port=6379, use_tool=None,
+                    batch_size=BULK_REPLAY_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+    """
+    Load a directory written by `export_bulk_csv` into a fresh graph
+    
+    With the `falkordb-bulk-insert` tool on PATH (or `use_tool=True`) the files
+    are handed to it. It packs them into binary GRAPH.BULK tokens, which is the
+    fastest path. Otherwise the CSVs are read back in `batch_size` row chunks and
+    written with the same UNWIND queries as a normal load. Any existing graph
+    of that name is replaced.
+    
+    Returns:
+        dict with nodes/relationships created, mode and elapsed seconds
+    """
+    start = time.time()
+    manifest_path = os.path.join(csv_dir, BULK_MANIFEST)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        return {'error': f'Cannot read bulk CSV manifest: {e}'}
+    for rel in manifest['relations']:
+        if not REL_TYPE_PATTERN.match(rel['type']):
+            return {'error': f"Invalid relationship type in manifest: {rel['type']!r}"}
+    for entry in manifest.get('labels', []):
+        if not REL_TYPE_PATTERN.match(entry['label']):
+            return {'error': f"Invalid label in manifest: {entry['label']!r}"}
+    
+    if use_tool is None:
+        use_tool = shutil.which(BULK_INSERT_TOOL) is not None
+    
+    db = FalkorDB(host=host, port=port)
+    graph = db.select_graph(graph_name)
+    try:
+        graph.delete()  # the bulk loader only writes to a graph that does not exist yet
+    except Exception:
+        pass
+    
+    failures = {}
+    node_total = manifest['nodes']['count']
+    rel_total = sum(rel['count'] for rel in manifest['relations'])
+    
+    if use_tool:
+        print(f"📦 Bulk inserting {node_total:,} nodes and {rel_total:,} relationships with {BULK_INSERT_TOOL}...")
+        try:
+            completed = subprocess.run(bulk_insert_command(csv_dir, manifest, graph_name, host, port))
+        except OSError as e:
+            return {'error': f'Cannot run {BULK_INSERT_TOOL}: {e}'}
+        if completed.returncode != 0:
+            return {'error': f'{BULK_INSERT_TOOL} exited with status {completed.returncode}'}
+        nodes_created, rels_created, failed_rows = node_total, rel_total, 0
+    else:
+        print(f"📦 Replaying {node_total:,} nodes in chunks of {batch_size:,}...")
+        node_rows = iter_bulk_csv_rows(os.path.join(csv_dir, manifest['nodes']['file']))
+        totals, failed_rows, _ = run_batches(
+            graph, ((NODE_BATCH_QUERY, rows) for rows in iter_chunks(node_rows, batch_size)),
+            max_in_flight, ('nodes_created',), failures=failures
+        )
+        nodes_created = totals['nodes_created']
+        create_node_indexes(graph, failures)
+        
+        print(f"📦 Replaying {rel_total:,} relationships...")
+        rels_created = 0
+        for rel in manifest['relations']:
+            query = edge_batch_query(rel['type'])
+            edge_rows = iter_bulk_csv_rows(os.path.join(csv_dir, rel['file']))
+            totals, failed, _ = run_batches(
+                graph, ((query, rows) for rows in iter_chunks(edge_rows, batch_size)),
+                max_in_flight, ('relationships_created',), failures=failures
+            )
+            rels_created += totals['relationships_created']
+            failed_rows += failed
+    
+    # Labels from rdf:type (in both modes: the bulk loader sets only :Resource)
+    labels_added = 0
+    if manifest.get('labels'):
+        if use_tool:
+            create_node_indexes(graph, failures)  # label batches match nodes by id
+        print(f"🏷️  Adding {len(manifest['labels'])} labels from rdf:type...")
+        for entry in manifest['labels']:
+            query = label_batch_query(entry['label'])
+            ids = (row[0] for row in iter_bulk_csv_rows(os.path.join(csv_dir, entry['file'])))
+            totals, failed, _ = run_batches(
+                graph, ((query, rows) for rows in iter_chunks(ids, batch_size)),
+                max_in_flight, ('labels_added',), failures=failures
+            )
+            labels_added += totals['labels_added']
+            failed_rows += failed
+        steps = [{'stage': 'after_labels', 'label': entry['label'], 'property': 'uri'}
+                 for entry in manifest['labels'] if entry['count'] >= LABEL_INDEX_MIN_NODES]
+        apply_index_plan(graph, steps, 'after_labels', failures)
+    
+    elapsed = time.time() - start
+    print(f"✅ Replayed {nodes_created:,} nodes and {rels_created:,} relationships in {elapsed:.1f}s")
+    return {
+        'graph_name': graph_name,
+        'mode': 'bulk-insert' if use_tool else 'replay',
+        'nodes_created': nodes_created,
+        'relationships_created': rels_created,
+        'relationship_types': len(manifest['relations']),
+        'labels_added': labels_added,
+        'failed_rows': failed_rows,
+        'failures': failures,
+        'elapsed_seconds': elapsed
+    }
+
+def _drop_duplicates(table):
+    """Dedupe a table read without rdflib, so line formats load like a parsed Graph"""
+    dropped = table.dedupe()
+    if dropped:
+        print(f"🧹 Dropped {dropped:,} duplicate triples")
+
+def build_triple_table(rdf_file_path, sample_size=None, workers=None, predicates=None,
+                       literal_properties=False, cache_dir=None, cache_max_bytes=TRIPLE_CACHE_MAX_BYTES,
+                       metrics=None):
+    """
+    Parse and process an RDF file into a TripleTable (the client half of a table load)
+    
+    With `cache_dir`, a cache hit skips parsing and a miss stores the new
+    table (see `TripleCache`). Arguments are as for `load_any_rdf_to_falkordb`.
+    
+    Returns:
+        dict with table, total_triples, parse/process/cache seconds, cache
+        status ('hit', 'stored', 'too_large' or None) and the file hash if
+        the cache computed it; or {'error': ...}
+    """
+    if predicates is None:
+        predicates = PredicateCache()
+    if metrics is None:
+        metrics = Metrics()
+    
+    try:
+        rdf_format, compression = detect_rdf_format(rdf_file_path)
+    except (OSError, ValueError) as e:
+        return {'error': f'Cannot read {rdf_file_path}: {e}'}
+    print(f"📄 Format: {rdf_format}{f' ({compression})' if compression else ''}")
+    
+    # Parsed-triple cache: same file and options -> straight to writing
+    cache = None
+    cache_status = None
+    cache_time = 0.0
+    file_hash = None
+    table = None
+    if cache_dir:
+        cache_start = time.time()
+        cache = TripleCache(cache_dir, cache_max_bytes)
+        cache_variant = TripleCache.variant(sample_size, literal_properties, predicates.table)
+        table, cached_mapping, file_hash, cache_entry = cache.lookup(rdf_file_path, cache_variant)
+        cache_time = time.time() - cache_start
+    
+    if table is not None:
+        cache_status = 'hit'
+        predicates.preload(cached_mapping)
+        parse_time = process_time = 0.0
+        total_triples = table.count
+        print(f"\n⚡ Using cached triples from {cache_entry} ({table.count:,} triples, no parsing)")
+    elif workers and workers > 1 and not sample_size and rdf_format in LINE_FORMATS and not compression:
+        # Parse + process in one pass across `workers` processes
+        print(f"\n📖 Parsing and processing with {workers} worker processes...")
+        parse_start = time.time()
+        metrics.phase_start('parse')
+        try:
+            table = process_ntriples_parallel(rdf_file_path, workers, predicates, literal_properties)
+        except ValueError as e:
+            metrics.phase_end('parse')
+            return {'error': str(e)}
+        _drop_duplicates(table)
+        metrics.phase_end('parse', table.count)
+        parse_time = time.time() - parse_start
+        total_triples = table.count
+        process_time = 0.0
+        print(f"✅ Parsed and processed {table.count:,} triples in {parse_time:.1f}s")
+    elif rdf_format in LINE_FORMATS:
+        # Line formats skip rdflib: tokenize, intern and group in one pass
+        if workers and workers > 1 and not sample_size:
+            print("⚠️  Compressed input cannot be split into byte ranges; reading it in one process")
+        print(f"\n📖 Parsing and processing {rdf_format} lines...")
+        parse_start = time.time()
+        metrics.phase_start('parse')
+        table = TripleTable(track_terms=True)
+        try:
+            for subj, pred, obj in iter_ntriples(rdf_file_path):
+                if sample_size and table.count >= sample_size:
+                    break
+                add_triple(table, subj, pred, obj, predicates, literal_properties)
+                if table.count % 100000 == 0:
+                    print(f"  Processed {table.count:,} ({_rate(table.count, time.time() - parse_start):.0f}/sec)")
+        except ValueError as e:
+            metrics.phase_end('parse')
+            return {'error': str(e)}
+        _drop_duplicates(table)
+        parse_time = time.time() - parse_start
+        total_triples = table.count
+        process_time = 0.0
+        metrics.phase_end('parse', table.count)
+        print(f"✅ Parsed and processed {table.count:,} triples in {parse_time:.1f}s")
+    else:
+        # Parse RDF
+        print(f"\n📖 Parsing RDF file...")
+        parse_start = time.time()
+        metrics.phase_start('parse')
+        
+        g = Graph()
+        if compression:
+            with open_rdf(rdf_file_path, 'rb', compression) as f:
+                g.parse(source=f, format=rdf_format)
+        else:
+            g.parse(rdf_file_path, format=rdf_format)
+        parse_time = time.time() - parse_start
+        total_triples = len(g)
+        metrics.phase_end('parse', total_triples)
+        
+        print(f"✅ Parsed {total_triples:,} triples in {parse_time:.1f}s")
+        
+        # Determine sample
+        if sample_size and sample_size < total_triples:
+            triples_to_load = sample_size
+            print(f"📋 Loading sample of {triples_to_load:,} triples")
+        else:
+            triples_to_load = total_triples
+            print(f"📋 Loading all {triples_to_load:,} triples")
+        
+        # Process triples - interned and grouped by type as we go
+        print(f"\n🔍 Processing triples...")
+        process_start = time.time()
+        metrics.phase_start('process')
+        
+        table = TripleTable()
+        
+        for subj, pred, obj in g:
+            if sample_size and table.count >= sample_size:
+                break
+            
+            add_triple(table, subj, pred, obj, predicates, literal_properties)
+            
+            if table.count % 100000 == 0:
+                elapsed = time.time() - process_start
+                rate = table.count / elapsed
+                print(f"  Processed {table.count:,}/{triples_to_load:,} ({rate:.0f}/sec)")
+        
+        del g
+        process_time = time.time() - process_start
+        metrics.phase_end('process', table.count)
+        print(f"✅ Processed {table.count:,} triples in {process_time:.1f}s")
+    
+    table.release_lookup()
+    if cache is not None and cache_status is None:
+        cache_start = time.time()
+        cache_entry = cache.store(rdf_file_path, file_hash, cache_variant, table, predicates.mapping())
+        cache_time += time.time() - cache_start
+        if cache_entry:
+            cache_status = 'stored'
+            print(f"💾 Cached processed triples in {cache_entry} ({cache_time:.1f}s)")
+        else:
+            cache_status = 'too_large'
+            print(f"⚠️  Processed triples exceed cache_max_bytes; not cached")
+    return {
+        'table': table,
+        'total_triples': total_triples,
+        'parse_seconds': parse_time,
+        'process_seconds': process_time,
+        'cache_seconds': cache_time,
+        'cache': cache_status,
+        'file_hash': file_hash
+    }
+
+def load_any_rdf_to_falkordb(rdf_file_path, graph_name=None, host='localhost', port=6379, sample_size=None,
+                             batch_size=DEFAULT_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT, stream=False,
+                             workers=None, rel_type_table=None, save_rel_type_table=None,
+                             resume=False, checkpoint_path=None, export_csv=None, literal_properties=False,
+                             pipeline=False, type_labels=True, index_properties=(), client=None,
+                             metrics=None, retries=0, cache_dir=None, cache_max_bytes=TRIPLE_CACHE_MAX_BYTES,
+                             verify=False, verify_sample=VERIFY_SAMPLE_SIZE):
     """
-    FINAL OPTIMIZED RDF loader - 700+ relationships/second
+    FINAL OPTIMIZED RDF loader - batched UNWIND writes
     
     Args:
         rdf_file_path: path to RDF file
@@ -25,163 +2043,263 @@ def load_any_rdf_to_falkordb(rdf_file_path, graph_name=None, host='localhost', p
         host: FalkorDB host
         port: FalkorDB port
         sample_size: number of triples to load (None for all)
+        batch_size: rows sent per UNWIND query
+        max_in_flight: number of batches outstanding at once
+        stream: read .nt/.nq/.ttl triple by triple and write bounded chunks
+                instead of building the whole graph in memory first
+        workers: parse and normalize .nt/.nq files in this many processes
+                 (full loads only; sample loads read serially)
+        rel_type_table: JSON file of predicate IRI -> relationship type to
+                        reuse instead of recomputing names
+        save_rel_type_table: write the predicate mapping used by this load here
+        resume: continue an interrupted load from its checkpoint instead of
+                clearing the graph (the input file must be unchanged); with
+                no checkpoint yet, start a fresh load that keeps one
+        checkpoint_path: checkpoint file (default: next to the input file,
+                         or the temp directory if that is read-only); giving
+                         it also keeps a checkpoint without `resume`
+        export_csv: write bulk-loader CSVs to this directory instead of
+                    loading (replay them with `replay_bulk_csv`)
+        literal_properties: store literal objects as properties of their
+                            subject node (lists when multi-valued) instead
+                            of as :Resource nodes with an edge
+        pipeline: run parsing, normalization and writes as concurrent
+                  asyncio stages over `max_in_flight` pooled connections
+                  (like `stream`, but overlapping client and server work)
+        type_labels: also label nodes with their rdf:type classes
+                     (e.g. :Resource:Synset); table loads only
+        index_properties: extra :Resource properties to index after the
+                          node insert (e.g. literal properties used for lookups)
+        client: FalkorDB-like object to use instead of connecting to
+                host:port (e.g. an in-process fake for client-only benchmarks)
+        metrics: `run_metrics.Metrics` sink for phase, batch, retry, failure
+                 and memory events (default: quiet)
+        retries: resubmit a batch this many times when the connection could
+                 not be opened; timeouts are never resent (see
+                 `failed_before_send`)
+        cache_dir: keep processed triples here (see `TripleCache`); later
+                   table loads of the same file skip parsing entirely
+        cache_max_bytes: evict least recently used cache entries beyond this
+        verify: afterwards, compare node, relationship type and label counts
+                with the processed table and look up a random sample of
+                its triples (see `verify_graph`); table loads only
+        verify_sample: triples looked up by `verify`
     
     Returns:
         dict with loading statistics
     """
     total_start = time.time()
+    if metrics is None:
+        metrics = Metrics()
     
     if graph_name is None:
-        graph_name = os.path.splitext(os.path.basename(rdf_file_path))[0]
+        graph_name = rdf_base_name(rdf_file_path)
     
     print(f"🚀 Loading: {rdf_file_path}")
     print(f"📊 Graph: {graph_name}")
     
-    # Parse RDF
-    print(f"\n📖 Parsing RDF file...")
-    parse_start = time.time()
-    
     if not os.path.exists(rdf_file_path):
         return {'error': f'File not found: {rdf_file_path}'}
     
-    g = Graph()
-    g.parse(rdf_file_path, format='turtle')
-    parse_time = time.time() - parse_start
-    total_triples = len(g)
+    predicates = PredicateCache()
+    if rel_type_table:
+        try:
+            predicates = PredicateCache(load_relationship_type_table(rel_type_table))
+        except (OSError, ValueError) as e:
+            return {'error': f'Cannot read relationship type table: {e}'}
+        print(f"📋 Using {len(predicates.table)} relationship types from {rel_type_table}")
     
-    print(f"✅ Parsed {total_triples:,} triples in {parse_time:.1f}s")
+    if stream and resume:
+        return {'error': 'resume is not supported in streaming mode'}
+    if stream and export_csv:
+        return {'error': 'export_csv is not supported in streaming mode'}
+    if literal_properties and (stream or export_csv):
+        return {'error': 'literal_properties is not supported with stream or export_csv'}
+    if pipeline and (stream or resume or export_csv or literal_properties):
+        return {'error': 'pipeline cannot be combined with stream, resume, export_csv or literal_properties'}
+    if pipeline and client is not None:
+        return {'error': 'pipeline mode opens its own async connections; client is not supported'}
+    if cache_dir and (stream or pipeline):
+        return {'error': 'cache_dir only applies to table loads (not stream or pipeline)'}
+    invalid = [prop for prop in index_properties if not REL_TYPE_PATTERN.match(prop)]
+    if invalid:
+        return {'error': f'Invalid index_properties: {invalid}'}
+    if verify and (stream or pipeline or export_csv):
+        return {'error': 'verify only applies to table loads; use verify_rdf_graph after a stream or pipeline load'}
     
-    # Determine sample
-    if sample_size and sample_size < total_triples:
-        triples_to_load = sample_size
-        print(f"📋 Loading sample of {triples_to_load:,} triples")
-    else:
-        triples_to_load = total_triples
-        print(f"📋 Loading all {triples_to_load:,} triples")
+    if pipeline:
+        result = _load_pipelined(rdf_file_path, graph_name, host, port, sample_size,
+                                 batch_size, max_in_flight, total_start, predicates, metrics, retries)
+        return _finish_predicates(result, predicates, save_rel_type_table)
     
-    # Process triples - SIMPLE AND FAST
-    print(f"\n🔍 Processing triples...")
-    process_start = time.time()
+    if stream:
+        result = _load_streaming(rdf_file_path, graph_name, host, port, sample_size,
+                                 batch_size, max_in_flight, total_start, predicates, client,
+                                 metrics, retries)
+        return _finish_predicates(result, predicates, save_rel_type_table)
     
-    nodes = set()  # Use set for uniqueness
-    relationships = []
-    rel_types = {}
-    count = 0
+    parsed = build_triple_table(rdf_file_path, sample_size, workers, predicates, literal_properties,
+                                cache_dir, cache_max_bytes, metrics)
+    if 'error' in parsed:
+        return parsed
+    table = parsed['table']
+    total_triples = parsed['total_triples']
+    parse_time = parsed['parse_seconds']
+    process_time = parsed['process_seconds']
+    cache_time = parsed['cache_seconds']
+    cache_status = parsed['cache']
+    file_hash = parsed['file_hash']
+    count = table.count
+    total_edges = table.edge_count
+    print(f"📊 Unique nodes: {len(table.uris):,}")
+    print(f"📊 Relationships: {total_edges:,} ({table.edge_buffer_bytes() / (1024*1024):.1f} MB of edge columns)")
+    print(f"📋 Relationship types: {len(table.rel_types)}")
+    if literal_properties:
+        literal_count = sum(table.literal_props.values())
+        print(f"📋 Literal values stored as properties: {literal_count:,} ({len(table.literal_props)} properties)")
     
-    for subj, pred, obj in g:
-        if sample_size and count >= sample_size:
-            break
-        
-        # Simple URI cleaning
-        subj_uri = str(subj)[:100].replace("'", "").replace('\\', '')
-        obj_uri = str(obj)[:100].replace("'", "").replace('\\', '')
-        
-        # Simple predicate name
-        pred_str = str(pred)
-        if '#' in pred_str:
-            pred_name = pred_str.split('#')[-1]
-        else:
-            pred_name = pred_str.split('/')[-1]
-        
-        pred_name = clean_relationship_name(pred_name)
-        rel_types[pred_name] = rel_types.get(pred_name, 0) + 1
-        
-        nodes.add(subj_uri)
-        nodes.add(obj_uri)
-        relationships.append((subj_uri, pred_name, obj_uri))
-        count += 1
-        
-        if count % 100000 == 0:
-            elapsed = time.time() - process_start
-            rate = count / elapsed
-            print(f"  Processed {count:,}/{triples_to_load:,} ({rate:.0f}/sec)")
+    if export_csv:
+        print(f"\n📦 Writing bulk loader CSVs to {export_csv}...")
+        export_start = time.time()
+        metrics.phase_start('export')
+        manifest = export_bulk_csv(table, export_csv, type_labels)
+        export_time = time.time() - export_start
+        metrics.phase_end('export', count)
+        print(f"✅ Wrote {len(manifest['relations']) + len(manifest['labels']) + 1} CSV files in {export_time:.1f}s")
+        return _finish_predicates({
+            'file': rdf_file_path,
+            'graph_name': graph_name,
+            'mode': 'export',
+            'export_dir': export_csv,
+            'triples_loaded': count,
+            'nodes': len(table.uris),
+            'relationships': total_edges,
+            'relationship_types': len(table.edges),
+            'elapsed_seconds': time.time() - total_start,
+            'workers': workers or 1,
+            'triple_cache': cache_status,
+            'phase_seconds': {
+                'parse': parse_time,
+                'process': process_time,
+                'cache': cache_time,
+                'export': export_time
+            }
+        }, predicates, save_rel_type_table)
     
-    process_time = time.time() - process_start
-    print(f"✅ Processed {count:,} triples in {process_time:.1f}s")
-    print(f"📊 Unique nodes: {len(nodes):,}")
-    print(f"📊 Relationships: {len(relationships):,}")
-    print(f"📋 Relationship types: {len(rel_types)}")
+    # Checkpoint tied to the exact input file, kept when asked for with
+    # resume or checkpoint_path
+    keep_checkpoint = resume or checkpoint_path is not None
+    if keep_checkpoint and checkpoint_path is None:
+        checkpoint_path = default_checkpoint_path(rdf_file_path, graph_name)
+    if keep_checkpoint and file_hash is None:
+        file_hash = file_sha256(rdf_file_path)
+    checkpoint = None
+    if resume and os.path.exists(checkpoint_path):
+        try:
+            checkpoint = LoadCheckpoint.load(checkpoint_path)
+        except (OSError, ValueError) as e:
+            return {'error': f'Cannot read checkpoint {checkpoint_path}: {e}'}
+        reason = checkpoint.mismatch(file_hash, graph_name, sample_size, table)
+        if reason:
+            return {'error': f'Cannot resume from {checkpoint_path}: {reason}'}
+        batch_size = checkpoint.state['batch_size']
+        print(f"\n♻️  Resuming from checkpoint: {checkpoint_path}")
+    elif resume:
+        print(f"\n⚠️  No checkpoint at {checkpoint_path}, starting a fresh load")
+    resumed = checkpoint is not None
+    if keep_checkpoint and not resumed:
+        # Written before the graph is cleared, so an unwritable path loses nothing
+        try:
+            checkpoint = LoadCheckpoint.start(checkpoint_path, file_hash, graph_name,
+                                              batch_size, sample_size, table)
+        except OSError as e:
+            return {'error': f'Cannot write checkpoint {checkpoint_path}: {e}'}
     
     # Connect to FalkorDB
-    db = FalkorDB(host=host, port=port)
+    db = client or FalkorDB(host=host, port=port)
     graph = db.select_graph(graph_name)
     
-    # Clear existing
-    graph.query("MATCH (n) DETACH DELETE n")
+    if not resumed:
+        # Clear existing
+        graph.query("MATCH (n) DETACH DELETE n")
     
     # Load nodes
-    print(f"\n📥 Loading {len(nodes):,} nodes...")
+    failures = {}
+    print(f"\n📥 Loading {len(table.uris):,} nodes...")
     node_start = time.time()
-    
-    node_list = list(nodes)
-    node_count = 0
-    for i in range(0, len(node_list), 10000):
-        batch = node_list[i:i + 10000]
-        for uri in batch:
-            graph.query(f"CREATE (n:Resource {{uri: '{uri}'}})")
-            node_count += 1
-        
-        if (i // 10000) % 5 == 0:
-            elapsed = time.time() - node_start
-            rate = node_count / elapsed
-            print(f"  Loaded {node_count:,}/{len(nodes):,} ({rate:.0f}/sec)")
-    
+    metrics.phase_start('nodes')
+    node_count, failed_nodes, skipped_nodes = write_nodes(
+        graph, table, batch_size, max_in_flight, checkpoint, failures, metrics, retries
+    )
     node_time = time.time() - node_start
+    metrics.phase_end('nodes', node_count)
+    if skipped_nodes:
+        print(f"⏭️  Skipped {skipped_nodes:,} nodes committed before the interruption")
     print(f"✅ Nodes loaded in {node_time:.1f}s")
     
-    # ✅ CRITICAL: Create index BEFORE relationships
-    print("\n🔧 Creating index for fast relationship creation...")
-    try:
-        graph.query("CREATE INDEX ON :Resource(uri)")
-        print("✅ Index created")
-    except:
-        print("⚠️  Index already exists")
+    # ✅ CRITICAL: Create index BEFORE relationships (and wait for it to be built)
+    index_plan = plan_indexes(table, index_properties, type_labels)
+    index_steps = []
+    if checkpoint is None or not checkpoint.state['indexes_created']:
+        print("\n🔧 Creating indexes for fast relationship creation...")
+        metrics.phase_start('index')
+        index_steps += apply_index_plan(graph, index_plan, 'after_nodes', failures)
+        metrics.phase_end('index')
+        if checkpoint is not None:
+            checkpoint.mark_indexes_created()
+    
+    # Labels from rdf:type, so typed lookups don't scan every :Resource
+    label_start = time.time()
+    labels_added, failed_labels, skipped_labels = 0, 0, 0
+    if type_labels and table.labels and not failed_nodes:
+        print(f"\n🏷️  Adding {len(table.labels)} labels from rdf:type...")
+        metrics.phase_start('labels')
+        labels_added, failed_labels, skipped_labels = write_labels(
+            graph, table, batch_size, max_in_flight, checkpoint, failures, metrics, retries
+        )
+        metrics.phase_end('labels', labels_added)
+    label_time = time.time() - label_start
+    if labels_added or skipped_labels:
+        metrics.phase_start('index')
+        index_steps += apply_index_plan(graph, index_plan, 'after_labels', failures)
+        metrics.phase_end('index')
+    index_time = sum(step['create_seconds'] + step['build_seconds'] for step in index_steps)
     
     # Load relationships - FAST with index
-    print(f"\n🔗 Creating {len(relationships):,} relationships...")
     rel_start = time.time()
+    metrics.phase_start('relationships')
+    if failed_nodes:
+        # Edges would silently miss their endpoints; leave them for the resume
+        print(f"\n⚠️  {failed_nodes:,} nodes failed, not creating relationships yet")
+        total_rels_created, failed_rels, failed_batches, skipped_rels = 0, total_edges, 0, 0
+    else:
+        print(f"\n🔗 Creating {total_edges:,} relationships...")
+        print(f"📋 Creating {len(table.edges)} relationship types")
+        total_rels_created, failed_rels, failed_batches, skipped_rels = write_edges(
+            graph, table, batch_size, max_in_flight, checkpoint, failures, metrics, retries
+        )
+        if skipped_rels:
+            print(f"⏭️  Skipped {skipped_rels:,} relationships committed before the interruption")
     
-    # Group by type for efficiency
-    rels_by_type = {}
-    for source, pred, target in relationships:
-        if pred not in rels_by_type:
-            rels_by_type[pred] = []
-        rels_by_type[pred].append((source, target))
-    
-    print(f"📋 Creating {len(rels_by_type)} relationship types")
-    
-    total_rels_created = 0
-    failed_rels = 0
-    
-    for rel_idx, (rel_type, rel_list) in enumerate(rels_by_type.items()):
-        if rel_idx % 10 == 0 or rel_idx == len(rels_by_type) - 1:
-            print(f"  [{rel_idx+1}/{len(rels_by_type)}] '{rel_type}': {len(rel_list):,}")
-        
-        type_created = 0
-        BATCH_SIZE = 10000
-        
-        for i in range(0, len(rel_list), BATCH_SIZE):
-            batch = rel_list[i:i + BATCH_SIZE]
-            
-            for source, target in batch:
-                try:
-                    query = f"""
-                    MATCH (s:Resource {{uri: '{source}'}})
-                    MATCH (t:Resource {{uri: '{target}'}})
-                    CREATE (s)-[:{rel_type}]->(t)
-                    """
-                    graph.query(query)
-                    type_created += 1
-                    total_rels_created += 1
-                except:
-                    failed_rels += 1
-            
-            if (i // BATCH_SIZE) % 10 == 0:
-                elapsed = time.time() - rel_start
-                rate = total_rels_created / elapsed
-                print(f"    Progress: {total_rels_created:,}/{len(relationships):,} ({rate:.0f}/sec)")
+    if failed_nodes or failed_labels or failed_rels:
+        if checkpoint is not None:
+            print(f"⚠️  Some batches failed; run again with resume=True to retry them ({checkpoint_path})")
+        else:
+            print("⚠️  Some batches failed; load with resume=True to keep a checkpoint that can retry them")
+    elif checkpoint is not None:
+        checkpoint.remove()
     
     rel_time = time.time() - rel_start
+    metrics.phase_end('relationships', total_rels_created)
+    
+    verification = None
+    verify_time = 0.0
+    if verify:
+        print(f"\n🔎 Verifying against the source ({verify_sample:,} sampled triples)...")
+        metrics.phase_start('verify')
+        verification = verify_table_load(graph, table, verify_sample, type_labels)
+        verify_time = metrics.phase_end('verify', verification.get('sample_checked'))
+        print_verification(verification)
     total_time = time.time() - total_start
     
     print(f"\n{'='*70}")
@@ -193,23 +2311,432 @@ def load_any_rdf_to_falkordb(rdf_file_path, graph_name=None, host='localhost', p
     print(f"  • Total time: {total_time:.1f}s ({total_time/60:.1f} min)")
     print(f"  • Triples loaded: {count:,}")
     print(f"  • Nodes created: {node_count:,}")
+    if labels_added:
+        print(f"  • Labels added: {labels_added:,} ({len(table.labels)} rdf:type labels)")
+    for step in index_steps:
+        print(f"  • Index :{step['label']}({step['property']}): {step['status'] or 'created'} "
+              f"in {step['create_seconds'] + step['build_seconds']:.1f}s")
     print(f"  • Relationships created: {total_rels_created:,}")
-    print(f"  • Relationship types: {len(rels_by_type)}")
-    print(f"  • Performance: {total_rels_created/rel_time:.0f} relationships/sec")
+    print(f"  • Relationship types: {len(table.edges)}")
+    if table.literal_props:
+        print(f"  • Literal properties: {sum(table.literal_props.values()):,} values in {len(table.literal_props)} properties")
+    print(f"  • Performance: {_rate(total_rels_created, rel_time):.0f} relationships/sec")
     print(f"  • Failed relationships: {failed_rels:,}")
+    for kind, entry in failures.items():
+        print(f"    - {kind}: {entry['batches']} batches ({entry['rows']:,} rows), e.g. {entry['example']}")
+    if verification:
+        print(f"  • Verification: {'error' if 'error' in verification else 'passed' if verification['ok'] else 'FAILED'}")
+    print(f"  • Batch size: {batch_size:,} ({max_in_flight} in flight)")
     
-    return {
+    return _finish_predicates({
         'file': rdf_file_path,
         'graph_name': graph_name,
         'triples_loaded': count,
         'nodes_created': node_count,
         'relationships_created': total_rels_created,
-        'relationship_types': len(rels_by_type),
+        'relationship_types': len(table.edges),
+        'literal_properties': dict(table.literal_props),
         'elapsed_seconds': total_time,
-        'performance_rps': total_rels_created / rel_time,
-        'failed_relationships': failed_rels
+        'performance_rps': _rate(total_rels_created, rel_time),
+        'edge_buffer_bytes': table.edge_buffer_bytes(),
+        'failed_nodes': failed_nodes,
+        'failed_relationships': failed_rels,
+        'failed_batches': failed_batches,
+        'failures': failures,
+        'labels_added': labels_added,
+        'failed_labels': failed_labels,
+        'index_plan': index_steps,
+        'resumed': resumed,
+        'skipped_nodes': skipped_nodes,
+        'skipped_relationships': skipped_rels,
+        'checkpoint': (checkpoint_path if checkpoint is not None and (failed_nodes or failed_labels or failed_rels)
+                       else None),
+        'batch_size': batch_size,
+        'max_in_flight': max_in_flight,
+        'workers': workers or 1,
+        'peak_rss_mb': metrics.peak_rss_mb,
+        'triple_cache': cache_status,
+        'verification': verification,
+        'phase_seconds': {
+            'parse': parse_time,
+            'process': process_time,
+            'cache': cache_time,
+            'nodes': node_time,
+            'index': index_time,
+            'labels': label_time,
+            'relationships': rel_time,
+            'verify': verify_time
+        },
+        'phase_throughput': {
+            'parse_triples_per_sec': _rate(total_triples, parse_time),
+            'process_triples_per_sec': _rate(count, process_time),
+            'nodes_per_sec': _rate(node_count, node_time),
+            'relationships_per_sec': _rate(total_rels_created, rel_time)
+        }
+    }, predicates, save_rel_type_table)
+
+def verify_rdf_graph(rdf_file_path, graph_name=None, host='localhost', port=6379, sample_size=None,
+                     rel_type_table=None, literal_properties=False, type_labels=True,
+                     verify_sample=VERIFY_SAMPLE_SIZE, seed=None, cache_dir=None, client=None):
+    """
+    Verify an already loaded graph against its RDF file (see `verify_graph`)
+    
+    Works after any load mode: the file is processed into a TripleTable as
+    a table load would do it (with `cache_dir`, a cached table is reused and
+    nothing is parsed). Pass the options the graph was loaded with;
+    streaming and pipeline loads add no rdf:type labels, so verify those
+    with type_labels=False.
+    
+    Returns:
+        `verify_graph` report, or {'error': ...}
+    """
+    if graph_name is None:
+        graph_name = rdf_base_name(rdf_file_path)
+    if not os.path.exists(rdf_file_path):
+        return {'error': f'File not found: {rdf_file_path}'}
+    predicates = PredicateCache()
+    if rel_type_table:
+        try:
+            predicates = PredicateCache(load_relationship_type_table(rel_type_table))
+        except (OSError, ValueError) as e:
+            return {'error': f'Cannot read relationship type table: {e}'}
+    
+    print(f"🔎 Verifying graph {graph_name} against {rdf_file_path}")
+    parsed = build_triple_table(rdf_file_path, sample_size, None, predicates, literal_properties, cache_dir)
+    if 'error' in parsed:
+        return parsed
+    db = client or FalkorDB(host=host, port=port)
+    report = verify_table_load(db.select_graph(graph_name), parsed['table'], verify_sample, type_labels, seed)
+    print_verification(report)
+    return report
+
+def _finish_predicates(result, predicates, save_path):
+    """Attach predicate cache stats to a load result and export the mapping if asked"""
+    if 'error' in result:
+        return result
+    result['predicate_cache'] = predicates.stats()
+    result['query_templates'] = query_template_stats()
+    if save_path:
+        save_relationship_type_table(save_path, predicates.mapping())
+        print(f"💾 Relationship type table saved to: {save_path}")
+    return result
+
+def _open_triple_stream(rdf_file_path, sample_size):
+    """
+    `iter_triples`, with the first triple read up front so an unreadable or
+    unknown format raises ValueError before the graph is cleared
+    """
+    triples = iter_triples(rdf_file_path, sample_size)
+    first = next(triples, None)
+    
+    def all_triples():
+        if first is not None:
+            yield first
+            yield from triples
+    
+    return all_triples()
+
+def _prepare_stream_graph(graph, metrics, failures, label):
+    """
+    Clear the graph and create the uri index that stream and pipeline writes
+    MERGE their endpoints on
+    
+    Returns:
+        (index_steps, index_seconds)
+    """
+    graph.query("MATCH (n) DETACH DELETE n")
+    print(f"\n🔧 Creating index before {label}...")
+    index_start = time.time()
+    metrics.phase_start('index')
+    index_steps = apply_index_plan(graph, plan_indexes(), 'before_writes', failures)
+    metrics.phase_end('index')
+    return index_steps, time.time() - index_start
+    
+def _partial_load_error(graph_name, mode, error):
+    """Error result for a stream or pipeline load that failed after it started writing"""
+    print(f"\n❌ {error}")
+    print(f"⚠️  Graph {graph_name} was cleared and is only partially loaded")
+    return {
+        'error': f'{error} (graph {graph_name} was cleared and is only partially loaded)',
+        'graph_name': graph_name,
+        'mode': mode,
+        'partial_graph': True
+    }
+
+def _stream_result(rdf_file_path, graph_name, mode, loaded, failures, index_steps, index_time,
+                   write_time, total_start, batch_size, max_in_flight, metrics):
+    """Print the summary of a stream or pipeline load and build its result dict"""
+    total_time = time.time() - total_start
+    count = loaded['triples']
+    
+    print(f"\n{'='*70}")
+    print("🎉 LOADING COMPLETE!")
+    print(f"{'='*70}")
+    print(f"📊 SUMMARY:")
+    print(f"  • File: {os.path.basename(rdf_file_path)}")
+    print(f"  • Graph: {graph_name}")
+    print(f"  • Total time: {total_time:.1f}s ({total_time/60:.1f} min)")
+    print(f"  • Triples loaded: {count:,}")
+    print(f"  • Nodes created: {loaded['nodes_created']:,}")
+    print(f"  • Relationships created: {loaded['relationships_created']:,}")
+    print(f"  • Relationship types: {len(loaded['rel_types'])}")
+    print(f"  • Performance: {_rate(count, write_time):.0f} triples/sec")
+    print(f"  • Failed relationships: {loaded['failed_relationships']:,}")
+    for kind, entry in failures.items():
+        print(f"    - {kind}: {entry['batches']} batches ({entry['rows']:,} rows), e.g. {entry['example']}")
+    if 'stages' in loaded:
+        print(f"  • Stage utilization (bottleneck: {loaded['bottleneck']}):")
+        for name, stage in loaded['stages'].items():
+            print(f"    - {name}: {stage['utilization']:.0%} busy, "
+                  f"{stage['starved_seconds']:.1f}s starved, {stage['blocked_seconds']:.1f}s blocked")
+    
+    result = {
+        'file': rdf_file_path,
+        'graph_name': graph_name,
+        'mode': mode,
+        'triples_loaded': count,
+        'nodes_created': loaded['nodes_created'],
+        'relationships_created': loaded['relationships_created'],
+        'relationship_types': len(loaded['rel_types']),
+        'elapsed_seconds': total_time,
+        'performance_rps': _rate(loaded['relationships_created'], write_time),
+        'failed_nodes': 0,
+        'failed_relationships': loaded['failed_relationships'],
+        'failed_batches': loaded['failed_batches'],
+        'failures': failures,
+        'index_plan': index_steps,
+        'batch_size': batch_size,
+        'max_in_flight': max_in_flight
+    }
+    if 'stages' in loaded:
+        result['stages'] = loaded['stages']
+        result['bottleneck'] = loaded['bottleneck']
+    result.update({
+        'peak_rss_mb': metrics.peak_rss_mb,
+        'phase_seconds': {
+            'index': index_time,
+            mode: write_time
+        },
+        'phase_throughput': {
+            f'{mode}_triples_per_sec': _rate(count, write_time),
+            'relationships_per_sec': _rate(loaded['relationships_created'], write_time)
+        }
+    })
+    return result
+
+def _load_streaming(rdf_file_path, graph_name, host, port, sample_size,
+                    batch_size, max_in_flight, total_start, predicates, client=None,
+                    metrics=None, retries=0):
+    """Streaming branch of `load_any_rdf_to_falkordb` (constant client memory)"""
+    try:
+        triples = _open_triple_stream(rdf_file_path, sample_size)
+    except ValueError as e:
+        return {'error': str(e)}
+    
+    db = client or FalkorDB(host=host, port=port)
+    graph = db.select_graph(graph_name)
+    failures = {}
+    if metrics is None:
+        metrics = Metrics()
+    index_steps, index_time = _prepare_stream_graph(graph, metrics, failures, 'streaming')
+    
+    print(f"\n🌊 Streaming triples in chunks of {batch_size:,}...")
+    stream_start = time.time()
+    metrics.phase_start('stream')
+    try:
+        loaded = stream_load(graph, triples, batch_size, max_in_flight, predicates, failures,
+                             metrics, retries)
+    except ValueError as e:
+        metrics.phase_end('stream')
+        return _partial_load_error(graph_name, 'stream', e)
+    stream_time = time.time() - stream_start
+    metrics.phase_end('stream', loaded['triples'])
+    
+    return _stream_result(rdf_file_path, graph_name, 'stream', loaded, failures, index_steps, index_time,
+                          stream_time, total_start, batch_size, max_in_flight, metrics)
+
+class StageClock:
+    """Busy, starved (waiting for input) and blocked (output queue full) seconds of a pipeline stage"""
+    
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self.items = 0
+    
+    async def get(self, queue):
+        start = time.perf_counter()
+        item = await queue.get()
+        self.starved += time.perf_counter() - start
+        return item
+    
+    async def put(self, queue, item):
+        start = time.perf_counter()
+        await queue.put(item)
+        self.blocked += time.perf_counter() - start
+    
+    def report(self, wall):
+        return {
+            'workers': self.workers,
+            'items': self.items,
+            'busy_seconds': self.busy,
+            'starved_seconds': self.starved,
+            'blocked_seconds': self.blocked,
+            'utilization': self.busy / (wall * self.workers) if wall > 0 else 0.0
+        }
+
+async def pipeline_load(graph, triples, batch_size=DEFAULT_BATCH_SIZE, writers=DEFAULT_MAX_IN_FLIGHT,
+                        predicates=None, failures=None, queue_chunks=PIPELINE_QUEUE_CHUNKS, metrics=None,
+                        retries=0):
+    """
+    Parse, normalize and write a triple stream as concurrent asyncio stages
+
+    parse -> [queue] -> normalize -> [queue] -> `writers` x write
+
+    Parsing and normalizing run in worker threads so the event loop keeps
+    sending batches meanwhile. Both queues hold at most `queue_chunks` chunks,
+    so a slow stage holds back the ones before it and memory stays flat.
+    `graph` is an async graph handle (its connection pool needs `writers`
+    connections). Edges are written like `stream_load` (endpoints MERGEd by
+    uri), so the uri index must exist first. A writer resends a batch up to
+    `retries` times when its connection could not be opened, as `run_batches`.
+
+    Returns:
+        dict like `stream_load`, plus per-stage `stages` utilization and the
+        `bottleneck` stage
+    """
+    parsed = asyncio.Queue(maxsize=queue_chunks)
+    grouped = asyncio.Queue(maxsize=queue_chunks)
+    clocks = {'parse': StageClock(), 'normalize': StageClock(), 'write': StageClock(writers)}
+    triples = iter(triples)
+    rel_types = {}
+    totals = {'nodes_created': 0, 'relationships_created': 0}
+    failed = {'rows': 0, 'batches': 0}
+    written = {'rows': 0, 'next_report': batch_size * 10}
+    start = time.perf_counter()
+    
+    async def parse():
+        clock = clocks['parse']
+        while True:
+            began = time.perf_counter()
+            chunk = await asyncio.to_thread(lambda: list(islice(triples, batch_size)))
+            clock.busy += time.perf_counter() - began
+            if not chunk:
+                break
+            clock.items += len(chunk)
+            await clock.put(parsed, chunk)
+        await parsed.put(None)
+    
+    async def normalize():
+        clock = clocks['normalize']
+        while True:
+            chunk = await clock.get(parsed)
+            if chunk is None:
+                break
+            began = time.perf_counter()
+            by_type = await asyncio.to_thread(group_chunk, chunk, predicates)
+            clock.busy += time.perf_counter() - began
+            clock.items += len(chunk)
+            for rel_type, rows in by_type.items():
+                rel_types[rel_type] = rel_types.get(rel_type, 0) + len(rows)
+                await clock.put(grouped, (edge_merge_query(rel_type), rows))
+        for _ in range(writers):
+            await grouped.put(None)
+    
+    async def write():
+        clock = clocks['write']
+        while True:
+            batch = await clock.get(grouped)
+            if batch is None:
+                return
+            query, rows = batch
+            began = time.perf_counter()
+            committed = False
+            for attempt in range(retries + 1):
+                try:
+                    result = await graph.query(query, {'rows': rows})
+                except Exception as e:
+                    category = classify_failure(e)
+                    if attempt < retries and failed_before_send(e):
+                        if metrics:
+                            metrics.retry('pipeline', len(rows), attempt + 1, category, e)
+                        continue
+                    failed['rows'] += len(rows)
+                    failed['batches'] += 1
+                    record_failure(failures, e, len(rows))
+                    if metrics:
+                        metrics.failure('pipeline', len(rows), category, e)
+                    break
+                for name in totals:
+                    totals[name] += getattr(result, name, 0) or 0
+                committed = True
+                break
+            latency = time.perf_counter() - began
+            clock.busy += latency
+            clock.items += len(rows)
+            written['rows'] += len(rows)
+            if committed and metrics:
+                rate = _rate(written['rows'], time.perf_counter() - start)
+                metrics.batch_committed('pipeline', len(rows), written['rows'], rate, latency)
+            if written['rows'] >= written['next_report']:
+                written['next_report'] += batch_size * 10
+                rate = _rate(written['rows'], time.perf_counter() - start)
+                print(f"  Written {written['rows']:,} triples ({rate:.0f}/sec)")
+    
+    await asyncio.gather(parse(), normalize(), *(write() for _ in range(writers)))
+    
+    wall = time.perf_counter() - start
+    stages = {name: clock.report(wall) for name, clock in clocks.items()}
+    return {
+        'triples': clocks['parse'].items,
+        'nodes_created': totals['nodes_created'],
+        'relationships_created': totals['relationships_created'],
+        'rel_types': rel_types,
+        'failed_relationships': failed['rows'],
+        'failed_batches': failed['batches'],
+        'stages': stages,
+        'bottleneck': max(stages, key=lambda name: stages[name]['utilization'])
     }
 
+def _load_pipelined(rdf_file_path, graph_name, host, port, sample_size,
+                    batch_size, writers, total_start, predicates, metrics=None, retries=0):
+    """Pipeline branch of `load_any_rdf_to_falkordb` (asyncio stages, pooled connections)"""
+    try:
+        triples = _open_triple_stream(rdf_file_path, sample_size)
+    except ValueError as e:
+        return {'error': str(e)}
+    
+    # Setup on a plain connection, then hand over to the async pool
+    graph = FalkorDB(host=host, port=port).select_graph(graph_name)
+    failures = {}
+    if metrics is None:
+        metrics = Metrics()
+    index_steps, index_time = _prepare_stream_graph(graph, metrics, failures, 'pipelining')
+    
+    async def run():
+        db = AsyncFalkorDB(host=host, port=port, max_connections=writers)
+        try:
+            return await pipeline_load(db.select_graph(graph_name), triples, batch_size,
+                                       writers, predicates, failures, metrics=metrics, retries=retries)
+        finally:
+            # falkordb 1.0.x has no FalkorDB.aclose; close the underlying redis pool
+            await db.connection.aclose()
+    
+    print(f"\n🚰 Pipelining chunks of {batch_size:,} triples through {writers} connections...")
+    pipeline_start = time.time()
+    metrics.phase_start('pipeline')
+    try:
+        loaded = asyncio.run(run())
+    except ValueError as e:
+        metrics.phase_end('pipeline')
+        return _partial_load_error(graph_name, 'pipeline', e)
+    pipeline_time = time.time() - pipeline_start
+    metrics.phase_end('pipeline', loaded['triples'])
+    
+    return _stream_result(rdf_file_path, graph_name, 'pipeline', loaded, failures, index_steps, index_time,
+                          pipeline_time, total_start, batch_size, writers, metrics)
+
 if __name__ == "__main__":
     print("🚀 LOADING FULL WORDNET DATASET (3.8M triples)")
     print("="*70)
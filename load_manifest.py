@@ -0,0 +1,381 @@
+"""
+Load several RDF files into their own FalkorDB graphs in one run
+
+A manifest lists (file, graph) pairs, e.g. several WordNet releases and
+language packs. Every file is parsed and processed in its own worker
+process (once per parse variant, however many graphs it goes to); each finished table is handed to this process through the triple
+cache (see `TripleCache`, memory-mapped, so nothing is re-parsed or pickled)
+and written by `load_any_rdf_to_falkordb` in a writer thread. All writers
+share one FalkorDB connection pool, and at most `max_queries` queries are
+on the server at once no matter how many graphs are loading. Wall time is
+close to the slowest single load instead of the sum of all of them.
+
+Manifest (JSON):
+
+    {
+      "defaults": {"literal_properties": true, "batch_size": 10000},
+      "loads": [
+        {"file": "data/english-wordnet-2024.ttl", "graph": "wordnet_2024"},
+        {"file": "data/omw-fr.nt.gz", "graph": "omw_fr", "sample_size": 100000}
+      ]
+    }
+
+A bare list of loads is accepted as well; `graph` defaults to the file name.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from falkordb import FalkorDB
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from generic_rdf_loader import (
+    TRIPLE_CACHE_MAX_BYTES, PredicateCache, TripleCache, build_triple_table,
+    load_any_rdf_to_falkordb, load_relationship_type_table, rdf_base_name
+)
+
+DEFAULT_MAX_QUERIES = 8
+
+# Loader options a manifest entry (or its defaults) may set
+MANIFEST_OPTIONS = (
+    'sample_size', 'workers', 'rel_type_table', 'save_rel_type_table', 'literal_properties',
+    'batch_size', 'max_in_flight', 'retries', 'type_labels', 'index_properties',
+    'resume', 'checkpoint_path', 'verify', 'verify_sample'
+)
+
+class LimitedGraph:
+    """Graph proxy whose queries wait for a slot of the shared limit"""
+    
+    def __init__(self, graph, pool):
+        self._graph = graph
+        self._pool = pool
+    
+    def query(self, *args, **kwargs):
+        with self._pool.slot():
+            return self._graph.query(*args, **kwargs)
+    
+    def ro_query(self, *args, **kwargs):
+        with self._pool.slot():
+            return self._graph.ro_query(*args, **kwargs)
+    
+    def delete(self):
+        with self._pool.slot():
+            return self._graph.delete()
+    
+    def __getattr__(self, name):
+        return getattr(self._graph, name)
+
+class SharedFalkorDB:
+    """
+    One FalkorDB connection pool shared by every load of a manifest
+    
+    Queries from all graphs and all of their in-flight batches take a slot
+    of one semaphore, so the server never sees more than `max_queries` at a
+    time; each load's own `max_in_flight` only decides how many of its
+    batches are queued for a slot.
+    
+    Args:
+        db: FalkorDB (or FalkorDB-like) client whose pool is shared
+        max_queries: global limit of concurrent queries
+    """
+    
+    def __init__(self, db, max_queries=DEFAULT_MAX_QUERIES):
+        self.db = db
+        self.max_queries = max_queries
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._slots = threading.BoundedSemaphore(max_queries)
+        self._lock = threading.Lock()
+    
+    def select_graph(self, graph_name):
+        return LimitedGraph(self.db.select_graph(graph_name), self)
+    
+    def slot(self):
+        return _QuerySlot(self)
+    
+    def _acquire(self):
+        self._slots.acquire()
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+    
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+class _QuerySlot:
+    def __init__(self, pool):
+        self.pool = pool
+    
+    def __enter__(self):
+        self.pool._acquire()
+    
+    def __exit__(self, *exc):
+        self.pool._release()
+
+def read_manifest(manifest):
+    """
+    Read and check a load manifest
+    
+    Args:
+        manifest: path of a manifest JSON file, or its parsed content
+    
+    Returns:
+        list of loads (dicts with file, graph and loader options, defaults applied)
+    
+    Raises:
+        ValueError: malformed manifest, unknown option, missing file or
+                    a graph name used twice
+    """
+    if isinstance(manifest, str):
+        with open(manifest, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    defaults = {}
+    if isinstance(manifest, dict):
+        defaults = manifest.get('defaults', {})
+        manifest = manifest.get('loads')
+    if not isinstance(manifest, list) or not manifest:
+        raise ValueError("manifest must be a non-empty list of loads (or {'defaults': ..., 'loads': [...]})")
+    
+    loads = []
+    graphs = set()
+    for number, entry in enumerate(manifest, 1):
+        if isinstance(entry, (list, tuple)) and len(entry) == 2:
+            entry = {'file': entry[0], 'graph': entry[1]}
+        if not isinstance(entry, dict) or 'file' not in entry:
+            raise ValueError(f"load {number}: expected {{'file': ..., 'graph': ...}}")
+        load = dict(defaults)
+        load.update(entry)
+        unknown = set(load) - {'file', 'graph'} - set(MANIFEST_OPTIONS)
+        if unknown:
+            raise ValueError(f"load {number}: unknown options {sorted(unknown)}")
+        if not os.path.exists(load['file']):
+            raise ValueError(f"load {number}: file not found: {load['file']}")
+        load['graph'] = load.get('graph') or rdf_base_name(load['file'])
+        if load['graph'] in graphs:
+            raise ValueError(f"load {number}: graph {load['graph']!r} appears twice")
+        graphs.add(load['graph'])
+        loads.append(load)
+    return loads
+
+def _parse_key(load):
+    """Loads with equal keys produce the same cache entry, so they share one parse"""
+    return (os.path.realpath(load['file']), load.get('sample_size'),
+            bool(load.get('literal_properties', False)), load.get('rel_type_table'))
+
+def _parse_load(load, cache_dir):
+    """Process-pool entry point: parse one file into the triple cache"""
+    start = time.time()
+    predicates = PredicateCache()
+    if load.get('rel_type_table'):
+        try:
+            predicates = PredicateCache(load_relationship_type_table(load['rel_type_table']))
+        except (OSError, ValueError) as e:
+            return {'error': f'Cannot read relationship type table: {e}'}
+    parsed = build_triple_table(load['file'], load.get('sample_size'), load.get('workers'), predicates,
+                                load.get('literal_properties', False), cache_dir, float('inf'))
+    if 'error' in parsed:
+        return parsed
+    return {
+        'triples': parsed['total_triples'],
+        'triple_cache': parsed['cache'],
+        'parse_seconds': time.time() - start
+    }
+
+def _write_load(load, db, cache_dir):
+    """Writer-thread entry point: load one graph from its cached table"""
+    options = {name: value for name, value in load.items() if name not in ('file', 'graph')}
+    return load_any_rdf_to_falkordb(load['file'], load['graph'], client=db, cache_dir=cache_dir,
+                                    cache_max_bytes=float('inf'), **options)
+
+def load_manifest(manifest, host='localhost', port=6379, parse_workers=None,
+                  max_queries=DEFAULT_MAX_QUERIES, cache_dir=None,
+                  cache_max_bytes=TRIPLE_CACHE_MAX_BYTES, client=None, verify=False):
+    """
+    Load every (file, graph) pair of a manifest concurrently
+    
+    Args:
+        manifest: manifest JSON path or content (see module docstring)
+        host: FalkorDB host
+        port: FalkorDB port
+        parse_workers: files parsed at once (default: one per file, up to the CPU count)
+        max_queries: global limit of concurrent queries across all graphs
+        cache_dir: keep the processed tables here for later runs; by default
+                   a temporary directory is used and removed afterwards
+        cache_max_bytes: evict least recently used cache entries beyond this
+                         once every load is done (with cache_dir)
+        client: FalkorDB-like object to share instead of connecting to host:port
+        verify: verify every graph after its load (unless its entry sets `verify`)
+    
+    Returns:
+        dict with the per-graph results, totals and timings (see
+        `print_manifest_report`)
+    """
+    total_start = time.time()
+    try:
+        loads = read_manifest(manifest)
+    except (OSError, ValueError) as e:
+        return {'error': f'Invalid manifest: {e}'}
+    if verify:
+        for load in loads:
+            load.setdefault('verify', True)
+    
+    if parse_workers is None:
+        parse_workers = min(len({_parse_key(load) for load in loads}), os.cpu_count() or 1)
+    db = SharedFalkorDB(client or FalkorDB(host=host, port=port, max_connections=max_queries), max_queries)
+    temporary_cache = cache_dir is None
+    if temporary_cache:
+        cache_dir = tempfile.mkdtemp(prefix='rdf-manifest-')
+    
+    print(f"🚀 Loading {len(loads)} graphs ({parse_workers} parse workers, {max_queries} concurrent queries)")
+    results = {}
+    parsed = {}
+    try:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=parse_workers, mp_context=context) as parsers, \
+                ThreadPoolExecutor(max_workers=len(loads)) as writers:
+            # One parse per file and variant; concurrent parses of the same
+            # cache entry would race when storing it
+            groups = {}
+            for load in loads:
+                groups.setdefault(_parse_key(load), []).append(load)
+            parsing = {parsers.submit(_parse_load, group[0], cache_dir): group for group in groups.values()}
+            writing = {}
+            # Each graph starts writing as soon as its own parse is done
+            for future in as_completed(parsing):
+                group = parsing[future]
+                try:
+                    info = future.result()
+                except Exception as e:
+                    info = {'error': f"{type(e).__name__}: {e}"}
+                for load in group:
+                    parsed[load['graph']] = info
+                    if 'error' in info:
+                        print(f"❌ {load['graph']}: {info['error']}")
+                        results[load['graph']] = info
+                        continue
+                    print(f"📤 {load['graph']}: parsed {info['triples']:,} triples "
+                          f"in {info['parse_seconds']:.1f}s, writing...")
+                    writing[writers.submit(_write_load, load, db, cache_dir)] = load
+            for future in as_completed(writing):
+                load = writing[future]
+                try:
+                    results[load['graph']] = future.result()
+                except Exception as e:
+                    results[load['graph']] = {'error': f"{type(e).__name__}: {e}"}
+    finally:
+        if temporary_cache:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        else:
+            TripleCache(cache_dir, cache_max_bytes).evict()
+    
+    graphs = []
+    for load in loads:
+        result = results[load['graph']]
+        parse_info = parsed.get(load['graph'], {})
+        parse_seconds = parse_info.get('parse_seconds', 0.0)
+        write_seconds = result.get('elapsed_seconds', 0.0)
+        graphs.append({
+            'graph_name': load['graph'],
+            'file': load['file'],
+            'error': result.get('error'),
+            'triples_loaded': result.get('triples_loaded', 0),
+            'nodes_created': result.get('nodes_created', 0),
+            'relationships_created': result.get('relationships_created', 0),
+            'failed_nodes': result.get('failed_nodes', 0),
+            'failed_labels': result.get('failed_labels', 0),
+            'failed_relationships': result.get('failed_relationships', 0),
+            'checkpoint': result.get('checkpoint'),
+            'verified': result['verification'].get('ok', False) if result.get('verification') else None,
+            'triple_cache': parse_info.get('triple_cache'),
+            'parse_seconds': parse_seconds,
+            'write_seconds': write_seconds,
+            'load_seconds': parse_seconds + write_seconds
+        })
+    
+    totals = {key: sum(graph[key] for graph in graphs)
+              for key in ('triples_loaded', 'nodes_created', 'relationships_created',
+                          'failed_nodes', 'failed_labels', 'failed_relationships')}
+    return {
+        'graphs': graphs,
+        'totals': totals,
+        'failed_graphs': [graph['graph_name'] for graph in graphs if graph['error']],
+        'wall_seconds': time.time() - total_start,
+        'slowest_load_seconds': max(graph['load_seconds'] for graph in graphs),
+        'sum_load_seconds': sum(graph['load_seconds'] for graph in graphs),
+        'parse_workers': parse_workers,
+        'max_queries': max_queries,
+        'peak_queries': db.peak_in_flight,
+        'results': results
+    }
+
+def print_manifest_report(report):
+    """Print the aggregated report of `load_manifest`"""
+    print(f"\n{'='*70}")
+    print("🎉 MANIFEST LOAD COMPLETE!" if not report['failed_graphs'] else "⚠️  MANIFEST LOAD FINISHED WITH ERRORS")
+    print(f"{'='*70}")
+    print(f"{'graph':<24} {'triples':>12} {'nodes':>12} {'rels':>12} {'failed':>8} {'parse s':>8} {'write s':>8}")
+    for graph in report['graphs']:
+        if graph['error']:
+            print(f"{graph['graph_name']:<24} ❌ {graph['error']}")
+            continue
+        failed = graph['failed_nodes'] + graph['failed_labels'] + graph['failed_relationships']
+        print(f"{graph['graph_name']:<24} {graph['triples_loaded']:>12,} {graph['nodes_created']:>12,} "
+              f"{graph['relationships_created']:>12,} {failed:>8,} "
+              f"{graph['parse_seconds']:>8.1f} {graph['write_seconds']:>8.1f}")
+    totals = report['totals']
+    print(f"\n📊 SUMMARY:")
+    print(f"  • Graphs: {len(report['graphs']) - len(report['failed_graphs'])} loaded, "
+          f"{len(report['failed_graphs'])} failed")
+    print(f"  • Triples loaded: {totals['triples_loaded']:,}")
+    print(f"  • Nodes created: {totals['nodes_created']:,}")
+    print(f"  • Relationships created: {totals['relationships_created']:,}")
+    print(f"  • Failed nodes/labels/relationships: {totals['failed_nodes']:,}/"
+          f"{totals['failed_labels']:,}/{totals['failed_relationships']:,}")
+    print(f"  • Wall time: {report['wall_seconds']:.1f}s (slowest load {report['slowest_load_seconds']:.1f}s, "
+          f"all loads one after another {report['sum_load_seconds']:.1f}s)")
+    print(f"  • Concurrent queries: peak {report['peak_queries']} of {report['max_queries']}")
+    verified = [graph for graph in report['graphs'] if graph['verified'] is not None]
+    if verified:
+        print(f"  • Verified: {sum(graph['verified'] for graph in verified)}/{len(verified)} graphs passed")
+    for graph in report['graphs']:
+        if graph['verified'] is False:
+            print(f"  • {graph['graph_name']}: verification FAILED")
+        if graph['checkpoint']:
+            print(f"  • {graph['graph_name']}: some batches failed; resume from {graph['checkpoint']}")
+
+def main():
+    """Main function for command line usage"""
+    parser = argparse.ArgumentParser(description='Load the RDF files of a manifest into FalkorDB graphs in parallel')
+    parser.add_argument('manifest', help='Manifest JSON of {"file", "graph"} loads')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=6379)
+    parser.add_argument('--parse-workers', type=int, help='Files parsed at once (default: one per file, up to CPUs)')
+    parser.add_argument('--max-queries', type=int, default=DEFAULT_MAX_QUERIES,
+                        help='Concurrent queries across all graphs')
+    parser.add_argument('--cache-dir', help='Keep processed triples here for later runs')
+    parser.add_argument('--verify', action='store_true', help='Verify every graph after its load')
+    parser.add_argument('-o', '--output', help='Write the aggregated report to this JSON file')
+    
+    args = parser.parse_args()
+    
+    report = load_manifest(args.manifest, args.host, args.port, args.parse_workers,
+                           args.max_queries, args.cache_dir, verify=args.verify)
+    
+    if 'error' in report:
+        print(f"\n❌ Manifest load failed: {report['error']}")
+        return
+    print_manifest_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\n💾 Report saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
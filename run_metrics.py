@@ -0,0 +1,183 @@
+"""
+Structured metrics hooks for the loader and the comparison tool
+
+`load_any_rdf_to_falkordb` and `compare_wordnet_files` take a `metrics`
+object and report events to it while they run. Every event is a flat dict
+with `event`, `time` (epoch seconds) and:
+
+    phase_start        phase
+    phase_end          phase, seconds, rows, rows_per_sec
+    batch_committed    phase, rows, rows_done, rows_per_sec, latency_seconds
+    retry              phase, rows, attempt, category, error
+    failure            phase, rows, category, error
+    memory_high_water  phase, peak_rss_mb
+    profile            phase, profiler, plus output / peak_mb / top
+
+`Metrics` is the quiet default: it drops every event. `JsonlMetrics` appends
+them to a JSON Lines file and `CallbackMetrics` passes them to a function.
+Each of them can also profile one phase with cProfile or tracemalloc.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILERS = ('cprofile', 'tracemalloc')
+PROFILE_TOP = 20
+
+def peak_rss_mb(children=False):
+    """
+    Peak resident set size of this process (or its finished children) in MB
+    
+    ru_maxrss is KB on Linux and bytes on macOS; None where it is unavailable.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+class Metrics:
+    """
+    Quiet metrics sink and the base class of the others
+    
+    Subclasses only override `handle`. Event methods may be called from
+    several threads; `handle` is always called under a lock.
+    
+    Args:
+        profile_phase: name of the phase to profile (e.g. 'relationships')
+        profiler: 'cprofile' (CPU time of the calling thread) or
+                  'tracemalloc' (allocations of all threads)
+        profile_output: cProfile: write stats here (for pstats/snakeviz)
+                        instead of printing the top functions
+        profile_top: functions or source lines to report
+    """
+    
+    def __init__(self, profile_phase=None, profiler='cprofile', profile_output=None, profile_top=PROFILE_TOP):
+        if profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {PROFILERS}, not {profiler!r}")
+        self.profile_phase = profile_phase
+        self.profiler = profiler
+        self.profile_output = profile_output
+        self.profile_top = profile_top
+        self.peak_rss_mb = None
+        self._started = {}
+        self._profile = None
+        self._lock = threading.Lock()
+    
+    def handle(self, record):
+        """Receive one event record; the default drops it"""
+    
+    def emit(self, event, **fields):
+        record = {'event': event, 'time': time.time()}
+        record.update(fields)
+        with self._lock:
+            self.handle(record)
+    
+    def phase_start(self, phase):
+        self.emit('phase_start', phase=phase)
+        self._started[phase] = time.perf_counter()
+        if phase == self.profile_phase:
+            self._start_profile()
+    
+    def phase_end(self, phase, rows=None):
+        """Close a phase; returns its seconds"""
+        seconds = time.perf_counter() - self._started.pop(phase, time.perf_counter())
+        if phase == self.profile_phase:
+            self._stop_profile(phase)
+        fields = {'phase': phase, 'seconds': seconds}
+        if rows is not None:
+            fields.update(rows=rows, rows_per_sec=rows / seconds if seconds > 0 else 0.0)
+        self.emit('phase_end', **fields)
+        self.sample_memory(phase)
+        return seconds
+    
+    def batch_committed(self, phase, rows, rows_done, rows_per_sec, latency_seconds):
+        self.emit('batch_committed', phase=phase, rows=rows, rows_done=rows_done,
+                  rows_per_sec=rows_per_sec, latency_seconds=latency_seconds)
+    
+    def retry(self, phase, rows, attempt, category, error):
+        self.emit('retry', phase=phase, rows=rows, attempt=attempt,
+                  category=category, error=f"{type(error).__name__}: {error}"[:200])
+    
+    def failure(self, phase, rows, category, error):
+        self.emit('failure', phase=phase, rows=rows,
+                  category=category, error=f"{type(error).__name__}: {error}"[:200])
+    
+    def sample_memory(self, phase=None):
+        """Emit `memory_high_water` if peak RSS grew since the last sample"""
+        peak = peak_rss_mb()
+        if peak is not None and (self.peak_rss_mb is None or peak > self.peak_rss_mb):
+            self.peak_rss_mb = peak
+            self.emit('memory_high_water', phase=phase, peak_rss_mb=peak)
+    
+    def close(self):
+        """Flush and release the sink"""
+    
+    def _start_profile(self):
+        if self.profiler == 'tracemalloc':
+            tracemalloc.start()
+            self._profile = True
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+    
+    def _stop_profile(self, phase):
+        if self._profile is None:
+            return
+        if self.profiler == 'tracemalloc':
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            top = [str(stat) for stat in snapshot.statistics('lineno')[:self.profile_top]]
+            print(f"🧠 tracemalloc for phase '{phase}': peak {peak / (1024 * 1024):.1f} MB")
+            for line in top:
+                print(f"  {line}")
+            self.emit('profile', phase=phase, profiler='tracemalloc', peak_mb=peak / (1024 * 1024), top=top)
+        else:
+            self._profile.disable()
+            if self.profile_output:
+                self._profile.dump_stats(self.profile_output)
+                print(f"🧠 cProfile stats for phase '{phase}' saved to: {self.profile_output}")
+                self.emit('profile', phase=phase, profiler='cprofile', output=self.profile_output)
+            else:
+                text = io.StringIO()
+                pstats.Stats(self._profile, stream=text).sort_stats('cumulative').print_stats(self.profile_top)
+                print(f"🧠 cProfile for phase '{phase}':")
+                print(text.getvalue())
+                self.emit('profile', phase=phase, profiler='cprofile', top=text.getvalue().splitlines())
+        self._profile = None
+
+class JsonlMetrics(Metrics):
+    """Append every event to `path` as one JSON object per line (flushed per event)"""
+    
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+    
+    def handle(self, record):
+        self._file.write(json.dumps(record, default=str) + '\n')
+        self._file.flush()
+    
+    def close(self):
+        self._file.close()
+
+class CallbackMetrics(Metrics):
+    """Pass every event to `callback(record)` (e.g. to feed a monitoring client)"""
+    
+    def __init__(self, callback, **kwargs):
+        super().__init__(**kwargs)
+        self.callback = callback
+    
+    def handle(self, record):
+        self.callback(record)
@@ -0,0 +1,431 @@
+"""
+Incremental FalkorDB update between two RDF releases
+
+Instead of clearing the graph and re-ingesting everything, compute which
+(normalized) triples were added and removed between two releases and apply
+only those changes to a graph loaded by `load_any_rdf_to_falkordb`.
+"""
+
+from falkordb import FalkorDB
+from rdflib import BNode
+import argparse
+import hashlib
+import json
+import os
+import time
+
+from generic_rdf_loader import (
+    DEFAULT_BATCH_SIZE, DEFAULT_MAX_IN_FLIGHT, NODE_BATCH_QUERY, RDF_TYPE, REL_TYPE_PATTERN,
+    PredicateCache, load_relationship_type_table, iter_triples, normalize_triple, class_label,
+    is_literal, run_batches, edge_uri_query, edge_delete_query, label_uri_query, label_remove_query,
+    rdf_base_name
+)
+
+def triple_digest(subj_uri, rel_type, obj_uri):
+    """8-byte digest of a normalized triple (what ends up in the graph)"""
+    key = f"{subj_uri}\x00{rel_type}\x00{obj_uri}".encode('utf-8')
+    return hashlib.blake2b(key, digest_size=8).digest()
+
+def label_digest(subj_uri, label):
+    """8-byte digest of an rdf:type label on a node"""
+    return hashlib.blake2b(f"{subj_uri}\x00{label}".encode('utf-8'), digest_size=8).digest()
+
+def iter_normalized(rdf_file_path, predicates):
+    """Stream the (subject_uri, relationship_type, object_uri) triples of a file"""
+    for triple, _ in iter_labelled(rdf_file_path, predicates):
+        yield triple
+
+def iter_labelled(rdf_file_path, predicates):
+    """
+    Stream (normalized triple, label) pairs of a file
+    
+    The label is the node label the loader derives from an rdf:type triple
+    (see `class_label`), None for every other triple.
+    
+    rdflib gives Turtle blank nodes new random IDs on every parse, so they
+    would never match between two releases (even a file against itself);
+    such files raise ValueError. N-Triples blank node labels are kept as they
+    are, so they must be stable between the two releases.
+    """
+    for subj, pred, obj in iter_triples(rdf_file_path):
+        if isinstance(subj, BNode) or isinstance(obj, BNode):
+            raise ValueError(f"{rdf_file_path} has blank nodes, which get new IDs on every Turtle parse "
+                             f"and cannot be diffed; convert it to N-Triples with stable blank node labels")
+        label = class_label(obj) if str(pred) == RDF_TYPE and not is_literal(obj) else None
+        yield normalize_triple(subj, pred, obj, predicates), label
+
+def diff_rdf_releases(old_rdf_path, new_rdf_path, predicates=None):
+    """
+    Triple-level difference between two RDF releases (new - old)
+    
+    Each file is streamed; only 8-byte digests of the old and new triples are
+    kept in memory, plus the added and removed triples themselves.
+    
+    Returns:
+        dict with 'added' and 'removed' lists of normalized triples, counts,
+        and 'labels_added'/'labels_removed' lists of (subject_uri, label)
+        for the rdf:type labels that change
+    """
+    if predicates is None:
+        predicates = PredicateCache()
+    
+    print(f"🔍 Hashing old release: {old_rdf_path}")
+    old_digests = {triple_digest(*t) for t in iter_normalized(old_rdf_path, predicates)}
+    
+    print(f"🔍 Scanning new release: {new_rdf_path}")
+    new_digests = set()
+    new_labels = set()
+    added = []
+    labels_added = []
+    for triple, label in iter_labelled(new_rdf_path, predicates):
+        digest = triple_digest(*triple)
+        if digest in new_digests:
+            continue
+        new_digests.add(digest)
+        if label:
+            new_labels.add(label_digest(triple[0], label))
+        if digest not in old_digests:
+            added.append(triple)
+            if label:
+                labels_added.append((triple[0], label))
+    
+    print(f"🔍 Collecting removed triples from old release...")
+    removed = []
+    labels_removed = []
+    seen = set()
+    for triple, label in iter_labelled(old_rdf_path, predicates):
+        digest = triple_digest(*triple)
+        if digest not in new_digests and digest not in seen:
+            seen.add(digest)
+            removed.append(triple)
+            # Another class IRI with the same local name may still give the label
+            if label and label_digest(triple[0], label) not in new_labels:
+                labels_removed.append((triple[0], label))
+    
+    return {
+        'old_triples': len(old_digests),
+        'new_triples': len(new_digests),
+        'added': added,
+        'removed': removed,
+        'labels_added': labels_added,
+        'labels_removed': labels_removed
+    }
+
+def save_triple_diff(path, diff):
+    """
+    Write a triple diff as JSON Lines
+    
+    Triples are {"op": "add"|"remove", "s", "type", "o"}, label changes are
+    {"op": "add_label"|"remove_label", "s", "label"}.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        for op, triples in (('add', diff['added']), ('remove', diff['removed'])):
+            for subj_uri, rel_type, obj_uri in triples:
+                f.write(json.dumps({'op': op, 's': subj_uri, 'type': rel_type, 'o': obj_uri},
+                                   ensure_ascii=False) + '\n')
+        for op, labels in (('add_label', diff.get('labels_added', [])),
+                           ('remove_label', diff.get('labels_removed', []))):
+            for subj_uri, label in labels:
+                f.write(json.dumps({'op': op, 's': subj_uri, 'label': label},
+                                   ensure_ascii=False) + '\n')
+
+def load_triple_diff(path):
+    """Read a triple diff written by `save_triple_diff`"""
+    diff = {'added': [], 'removed': [], 'labels_added': [], 'labels_removed': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get('op') in ('add_label', 'remove_label'):
+                if not REL_TYPE_PATTERN.match(record['label']):
+                    raise ValueError(f"{path}:{line_no}: invalid label {record['label']!r}")
+                key = 'labels_added' if record['op'] == 'add_label' else 'labels_removed'
+                diff[key].append((record['s'], record['label']))
+                continue
+            if record.get('op') not in ('add', 'remove'):
+                raise ValueError(f"{path}:{line_no}: unknown op {record.get('op')!r}")
+            if not REL_TYPE_PATTERN.match(record['type']):
+                raise ValueError(f"{path}:{line_no}: invalid relationship type {record['type']!r}")
+            key = 'added' if record['op'] == 'add' else 'removed'
+            diff[key].append((record['s'], record['type'], record['o']))
+    return diff
+
+def _group_by_type(triples):
+    by_type = {}
+    for subj_uri, rel_type, obj_uri in triples:
+        by_type.setdefault(rel_type, []).append([subj_uri, obj_uri])
+    return by_type
+
+def _batched(query, rows, batch_size):
+    for i in range(0, len(rows), batch_size):
+        yield query, rows[i:i + batch_size]
+
+def existing_node_uris(graph, uris, batch_size=DEFAULT_BATCH_SIZE):
+    """Which of `uris` already exist as :Resource nodes (indexed lookups, batched)"""
+    found = set()
+    for i in range(0, len(uris), batch_size):
+        result = graph.ro_query(
+            "UNWIND $rows AS u MATCH (n:Resource {uri: u}) RETURN n.uri",
+            {'rows': uris[i:i + batch_size]}
+        )
+        found.update(row[0] for row in result.result_set)
+    return found
+
+def literal_property_node(graph):
+    """
+    URI of a node that carries more than `id` and `uri`, or None
+    
+    Only a `literal_properties=True` load stores literals as node properties.
+    Sync keeps literals as :Resource nodes and its orphan cleanup does not
+    look at properties, so such a graph cannot be synced.
+    """
+    result = graph.ro_query("MATCH (n:Resource) WHERE size(keys(n)) > 2 RETURN n.uri LIMIT 1")
+    return result.result_set[0][0] if result.result_set else None
+
+def next_node_id(graph):
+    """First unused :Resource id (new nodes continue the loader's dense IDs)"""
+    result = graph.ro_query("MATCH (n:Resource) RETURN max(n.id)")
+    max_id = result.result_set[0][0] if result.result_set else None
+    return 0 if max_id is None else max_id + 1
+
+def _group_by_label(labels):
+    by_label = {}
+    for subj_uri, label in labels:
+        by_label.setdefault(label, []).append(subj_uri)
+    return by_label
+
+def apply_triple_diff(graph, diff, batch_size=DEFAULT_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                      type_labels=True):
+    """
+    Apply a triple diff to an already loaded graph
+    
+    Order matters: new nodes and edges are added first, then removed edges are
+    deleted, then endpoints of removed edges that are left without any edge
+    are deleted (they no longer occur in any triple). With `type_labels`, the
+    rdf:type labels of the diff are set after the new edges and removed before
+    the orphan cleanup, matching a graph loaded with `type_labels=True`.
+    
+    Returns:
+        dict with created/deleted counts, failures and per-phase seconds
+    """
+    phase_seconds = {}
+    failed_rows = 0
+    failures = {}
+    
+    # New nodes
+    start = time.time()
+    endpoints = list({uri for s, _, o in diff['added'] for uri in (s, o)})
+    known = existing_node_uris(graph, endpoints, batch_size)
+    missing = [uri for uri in endpoints if uri not in known]
+    first_id = next_node_id(graph)
+    node_rows = [[node_id, uri] for node_id, uri in enumerate(missing, first_id)]
+    totals, failed, _ = run_batches(
+        graph, _batched(NODE_BATCH_QUERY, node_rows, batch_size), max_in_flight, ('nodes_created',),
+        failures=failures
+    )
+    nodes_created = totals['nodes_created']
+    failed_rows += failed
+    phase_seconds['add_nodes'] = time.time() - start
+    print(f"✅ Created {nodes_created:,} new nodes")
+    
+    # New edges
+    start = time.time()
+    relationships_created = 0
+    for rel_type, rows in _group_by_type(diff['added']).items():
+        totals, failed, _ = run_batches(
+            graph, _batched(edge_uri_query(rel_type), rows, batch_size), max_in_flight,
+            ('relationships_created',), failures=failures
+        )
+        relationships_created += totals['relationships_created']
+        failed_rows += failed
+    phase_seconds['add_relationships'] = time.time() - start
+    print(f"✅ Created {relationships_created:,} relationships")
+    
+    labels_added = 0
+    if type_labels:
+        start = time.time()
+        for label, uris in _group_by_label(diff.get('labels_added', [])).items():
+            totals, failed, _ = run_batches(
+                graph, _batched(label_uri_query(label), uris, batch_size), max_in_flight,
+                ('labels_added',), failures=failures
+            )
+            labels_added += totals['labels_added']
+            failed_rows += failed
+        phase_seconds['add_labels'] = time.time() - start
+        print(f"✅ Added {labels_added:,} type labels")
+    
+    # Removed edges
+    start = time.time()
+    relationships_deleted = 0
+    for rel_type, rows in _group_by_type(diff['removed']).items():
+        totals, failed, _ = run_batches(
+            graph, _batched(edge_delete_query(rel_type), rows, batch_size), max_in_flight,
+            ('relationships_deleted',), failures=failures
+        )
+        relationships_deleted += totals['relationships_deleted']
+        failed_rows += failed
+    phase_seconds['remove_relationships'] = time.time() - start
+    print(f"✅ Deleted {relationships_deleted:,} relationships")
+    
+    labels_removed = 0
+    if type_labels:
+        start = time.time()
+        for label, uris in _group_by_label(diff.get('labels_removed', [])).items():
+            totals, failed, _ = run_batches(
+                graph, _batched(label_remove_query(label), uris, batch_size), max_in_flight,
+                ('labels_removed',), failures=failures
+            )
+            labels_removed += totals['labels_removed']
+            failed_rows += failed
+        phase_seconds['remove_labels'] = time.time() - start
+        print(f"✅ Removed {labels_removed:,} type labels")
+    
+    # Orphaned nodes
+    start = time.time()
+    candidates = list({uri for s, _, o in diff['removed'] for uri in (s, o)})
+    query = "UNWIND $rows AS u MATCH (n:Resource {uri: u}) WHERE NOT (n)--() DELETE n"
+    totals, failed, _ = run_batches(
+        graph, _batched(query, candidates, batch_size), max_in_flight, ('nodes_deleted',),
+        failures=failures
+    )
+    nodes_deleted = totals['nodes_deleted']
+    failed_rows += failed
+    phase_seconds['remove_nodes'] = time.time() - start
+    print(f"✅ Deleted {nodes_deleted:,} orphaned nodes")
+    
+    return {
+        'nodes_created': nodes_created,
+        'relationships_created': relationships_created,
+        'relationships_deleted': relationships_deleted,
+        'labels_added': labels_added,
+        'labels_removed': labels_removed,
+        'nodes_deleted': nodes_deleted,
+        'failed_rows': failed_rows,
+        'failures': failures,
+        'phase_seconds': phase_seconds
+    }
+
+def sync_rdf_releases(old_rdf_path=None, new_rdf_path=None, graph_name=None, host='localhost', port=6379,
+                      diff_path=None, save_diff=None, rel_type_table=None,
+                      batch_size=DEFAULT_BATCH_SIZE, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                      type_labels=True):
+    """
+    Bring a graph loaded from `old_rdf_path` up to date with `new_rdf_path`
+    
+    Graphs loaded with `literal_properties=True` are refused: sync stores
+    literals as nodes, like the default load.
+    
+    Args:
+        old_rdf_path: release the graph currently holds (.nt, .nq or .ttl)
+        new_rdf_path: release to move to
+        graph_name: graph in FalkorDB (default: name of the old file)
+        host: FalkorDB host
+        port: FalkorDB port
+        diff_path: precomputed diff from `save_triple_diff` (skips both files)
+        save_diff: also write the computed diff to this JSON Lines file
+        rel_type_table: relationship type table used for the original load
+        batch_size: rows per UNWIND query
+        max_in_flight: number of batches outstanding at once
+        type_labels: keep rdf:type node labels in step (as the original load's
+                     `type_labels`)
+    
+    Returns:
+        dict with sync statistics
+    """
+    total_start = time.time()
+    
+    predicates = PredicateCache()
+    if rel_type_table:
+        try:
+            predicates = PredicateCache(load_relationship_type_table(rel_type_table))
+        except (OSError, ValueError) as e:
+            return {'error': f'Cannot read relationship type table: {e}'}
+    
+    if not diff_path:
+        if not old_rdf_path or not new_rdf_path:
+            return {'error': 'Need both releases or a precomputed diff'}
+        for path in (old_rdf_path, new_rdf_path):
+            if not os.path.exists(path):
+                return {'error': f'File not found: {path}'}
+    if graph_name is None:
+        graph_name = rdf_base_name(old_rdf_path or diff_path)
+    
+    db = FalkorDB(host=host, port=port)
+    graph = db.select_graph(graph_name)
+    
+    literal_node = literal_property_node(graph)
+    if literal_node is not None:
+        return {'error': f'Graph {graph_name} was loaded with literal_properties=True '
+                         f'(e.g. {literal_node}); sync only supports literals as nodes, reload it instead'}
+    
+    diff_start = time.time()
+    try:
+        if diff_path:
+            print(f"📄 Using precomputed diff: {diff_path}")
+            diff = load_triple_diff(diff_path)
+        else:
+            diff = diff_rdf_releases(old_rdf_path, new_rdf_path, predicates)
+    except (OSError, ValueError) as e:
+        return {'error': str(e)}
+    diff_time = time.time() - diff_start
+    
+    if save_diff:
+        save_triple_diff(save_diff, diff)
+        print(f"💾 Diff saved to: {save_diff}")
+    
+    print(f"📊 Added triples: {len(diff['added']):,}")
+    print(f"📊 Removed triples: {len(diff['removed']):,}")
+    if type_labels:
+        print(f"📊 Type labels: +{len(diff.get('labels_added', [])):,} "
+              f"-{len(diff.get('labels_removed', [])):,}")
+    
+    print(f"\n🔄 Applying diff to graph: {graph_name}")
+    apply_start = time.time()
+    applied = apply_triple_diff(graph, diff, batch_size, max_in_flight, type_labels)
+    apply_time = time.time() - apply_start
+    total_time = time.time() - total_start
+    
+    changed = len(diff['added']) + len(diff['removed'])
+    rate = changed / apply_time if apply_time > 0 else 0.0
+    print(f"\n🎉 SYNC COMPLETE in {total_time:.1f}s ({rate:.0f} changes/sec)")
+    
+    applied['phase_seconds'] = dict(diff=diff_time, **applied['phase_seconds'])
+    return dict({
+        'graph_name': graph_name,
+        'old_file': old_rdf_path,
+        'new_file': new_rdf_path,
+        'diff_file': diff_path,
+        'triples_added': len(diff['added']),
+        'triples_removed': len(diff['removed']),
+        'elapsed_seconds': total_time
+    }, **applied)
+
+def main():
+    """Main function for command line usage"""
+    parser = argparse.ArgumentParser(description='Apply the difference between two RDF releases to a FalkorDB graph')
+    parser.add_argument('old', nargs='?', help='Release currently loaded (e.g., 2024 .nt/.ttl)')
+    parser.add_argument('new', nargs='?', help='Release to update to (e.g., 2025 .nt/.ttl)')
+    parser.add_argument('-g', '--graph', help='FalkorDB graph name')
+    parser.add_argument('--diff', help='Precomputed triple diff (JSON Lines) instead of two releases')
+    parser.add_argument('--save-diff', help='Write the computed triple diff to this file')
+    parser.add_argument('--rel-types', help='Relationship type table used for the original load')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=6379)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--no-type-labels', action='store_true',
+                        help='The graph was loaded without rdf:type node labels')
+    
+    args = parser.parse_args()
+    
+    result = sync_rdf_releases(args.old, args.new, args.graph, args.host, args.port,
+                               args.diff, args.save_diff, args.rel_types, args.batch_size,
+                               type_labels=not args.no_type_labels)
+    
+    if 'error' in result:
+        print(f"\n❌ Sync failed: {result['error']}")
+    else:
+        print(f"\n📋 Sync result: {result}")
+
+if __name__ == "__main__":
+    main()